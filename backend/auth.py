@@ -20,11 +20,26 @@ def _get_secret() -> bytes:
     return os.getenv("AUTH_SECRET", "poster-gen-token-secret-v1").encode()
 
 
+# sha256(password) → derived PBKDF2 key, filled only on successful logins so
+# repeat logins skip the 100k iterations while wrong guesses always pay them.
+_verify_cache: dict[bytes, bytes] = {}
+_VERIFY_CACHE_MAX = 8
+
+
 def verify_password(username: str, password: str) -> bool:
     if username != _ADMIN_USER:
         return False
-    h = hashlib.pbkdf2_hmac("sha256", password.encode(), _SALT.encode(), 100000)
+    pw = password.encode()
+    key = hashlib.sha256(pw).digest()
     expected = base64.b64decode(_PASSWORD_HASH)
+    h = _verify_cache.get(key)
+    if h is None:
+        h = hashlib.pbkdf2_hmac("sha256", pw, _SALT.encode(), 100000)
+        if not hmac.compare_digest(h, expected):
+            return False
+        if len(_verify_cache) >= _VERIFY_CACHE_MAX:
+            _verify_cache.pop(next(iter(_verify_cache)))
+        _verify_cache[key] = h
     return hmac.compare_digest(h, expected)
 
 
@@ -35,7 +50,19 @@ def create_token(username: str) -> str:
     return f"{payload_b64}.{sig}"
 
 
+# token → exp for tokens that already passed signature checks
+_token_cache: dict[str, float] = {}
+_TOKEN_CACHE_MAX = 256
+
+
 def verify_token(token: str) -> bool:
+    now = time.time()
+    exp = _token_cache.get(token)
+    if exp is not None:
+        if exp >= now:
+            return True
+        del _token_cache[token]
+        return False
     try:
         parts = token.split(".", 1)
         if len(parts) != 2:
@@ -43,12 +70,24 @@ def verify_token(token: str) -> bool:
         payload_b64, sig = parts
         expected_sig = hmac.new(
             _get_secret(), payload_b64.encode(), hashlib.sha256
-        ).hexdigest()
-        if not hmac.compare_digest(sig, expected_sig):
+        ).digest()
+        if not hmac.compare_digest(bytes.fromhex(sig), expected_sig):
             return False
         payload = json.loads(base64.urlsafe_b64decode(payload_b64))
-        if payload.get("exp", 0) < time.time():
+        exp = payload.get("exp", 0)
+        if exp < now:
             return False
+        if len(_token_cache) >= _TOKEN_CACHE_MAX:
+            _purge_token_cache(now)
+        _token_cache[token] = exp
         return True
     except Exception:
         return False
+
+
+def _purge_token_cache(now: float) -> None:
+    """Drop expired tokens; if still full, drop the oldest entry."""
+    for token in [t for t, exp in _token_cache.items() if exp < now]:
+        del _token_cache[token]
+    if len(_token_cache) >= _TOKEN_CACHE_MAX:
+        _token_cache.pop(next(iter(_token_cache)))
@@ -5,13 +5,19 @@ with rate limiting, progress tracking, and error recovery.
 """
 
 import asyncio
-import uuid
+import os
 import time
 import json
+import logging
 from dataclasses import dataclass, field
 from typing import Optional
 from enum import Enum
 
+from config import ModelKey, SizeKey, generation_dims
+from sizes import COMPOSITION_SUFFIX
+
+logger = logging.getLogger(__name__)
+
 
 class BatchStatus(str, Enum):
     PENDING = "pending"
@@ -21,7 +27,7 @@ class BatchStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+@dataclass(slots=True)
 class BatchItemResult:
     prompt_id: str
     prompt_name: str = ""
@@ -60,6 +66,42 @@ class BatchJob:
     use_variations: bool = False
     variation_index: Optional[int] = None
     delay_between: float = 3.0
+    concurrency: int = 4
+    batch_size: int = 8
+
+    # prompt_id → library prompt, resolved once when the batch is created
+    prompts_cache: dict = field(default_factory=dict)
+
+    # Progress counters, maintained by _set_item_status
+    _completed: int = field(default=0, init=False, repr=False)  # complete + skipped
+    _complete: int = field(default=0, init=False, repr=False)  # complete only
+    _failed: int = field(default=0, init=False, repr=False)
+    # prompt_id → None for items currently generating (dict keeps start order)
+    _generating: dict = field(default_factory=dict, init=False, repr=False)
+
+    def _set_item_status(self, item: BatchItemResult, new_status: str):
+        """Move an item to new_status, keeping the progress counters in sync."""
+        old_status = item.status
+        if old_status == new_status:
+            return
+        if old_status in ("complete", "skipped"):
+            self._completed -= 1
+            if old_status == "complete":
+                self._complete -= 1
+        elif old_status == "failed":
+            self._failed -= 1
+        item.status = new_status
+        if new_status in ("complete", "skipped"):
+            self._completed += 1
+            if new_status == "complete":
+                self._complete += 1
+        elif new_status == "failed":
+            self._failed += 1
+
+        if new_status == "generating":
+            self._generating[item.prompt_id] = None
+        elif old_status == "generating":
+            self._generating.pop(item.prompt_id, None)
 
     @property
     def total(self) -> int:
@@ -67,25 +109,30 @@ class BatchJob:
 
     @property
     def completed_count(self) -> int:
-        return sum(1 for i in self.items.values() if i.status in ("complete", "skipped"))
+        return self._completed
+
+    @property
+    def complete_count(self) -> int:
+        """Items that generated successfully (completed_count also counts skipped)."""
+        return self._complete
 
     @property
     def failed_count(self) -> int:
-        return sum(1 for i in self.items.values() if i.status == "failed")
+        return self._failed
 
     @property
     def progress_percent(self) -> float:
         if self.total == 0:
             return 100.0
-        done = self.completed_count + self.failed_count
-        return round(done / self.total * 100, 1)
+        return round((self._completed + self._failed) / self.total * 100, 1)
 
     @property
     def current_item(self) -> Optional[str]:
-        for pid, item in self.items.items():
-            if item.status == "generating":
-                return pid
-        return None
+        return next(iter(self._generating), None)
+
+    @property
+    def current_items(self) -> list:
+        return list(self._generating)
 
     def to_dict(self, include_items=False):
         d = {
@@ -96,6 +143,7 @@ class BatchJob:
             "failed": self.failed_count,
             "progress_percent": self.progress_percent,
             "current_item": self.current_item,
+            "current_items": self.current_items,
             "model_id": self.model_id,
             "size_id": self.size_id,
             "created_at": self.created_at,
@@ -110,10 +158,15 @@ class BatchJob:
 class BatchManager:
     """Manages batch generation jobs."""
 
-    def __init__(self, notifier=None):
+    def __init__(self, notifier=None, db_concurrency: int = 8):
         self._jobs: dict = {}
         self._tasks: dict = {}
         self._notifier = notifier
+        self._notify_tasks: set = set()
+        # Caps in-flight DB writes across all batches so a slow database
+        # applies backpressure instead of piling up coroutines.
+        self._db_concurrency = db_concurrency
+        self._db_sem = asyncio.Semaphore(db_concurrency)
 
     def create_batch(
         self,
@@ -124,8 +177,15 @@ class BatchManager:
         use_variations: bool = False,
         variation_index: Optional[int] = None,
         delay_between: float = 3.0,
+        concurrency: int = 4,
+        batch_size: int = 8,
+        prompt_lib=None,
     ) -> BatchJob:
-        batch_id = str(uuid.uuid4())[:8]
+        batch_id = os.urandom(4).hex()
+        for _ in range(3):
+            if batch_id not in self._jobs:
+                break
+            batch_id = os.urandom(4).hex()
         job = BatchJob(
             batch_id=batch_id,
             prompt_ids=prompt_ids,
@@ -135,9 +195,13 @@ class BatchManager:
             use_variations=use_variations,
             variation_index=variation_index,
             delay_between=delay_between,
+            concurrency=max(1, concurrency),
+            batch_size=max(1, batch_size),
         )
         for pid in prompt_ids:
             job.items[pid] = BatchItemResult(prompt_id=pid)
+            if prompt_lib is not None:
+                job.prompts_cache[pid] = prompt_lib.get_prompt(pid)
         self._jobs[batch_id] = job
         return job
 
@@ -151,114 +215,187 @@ class BatchManager:
         job.started_at = time.time()
 
         # Resolve model UUID
-        model_config = models.get(job.model_id, models.get("phoenix"))
-        model_uuid = model_config["id"]
+        model_config = models.get(job.model_id, models.get(ModelKey.PHOENIX))
+        model_uuid = model_config.id
+        model_name = model_config.name
 
         # Resolve size dimensions (scale proportionally to fit Leonardo max of 1536)
-        size_config = sizes.get(job.size_id, sizes.get("poster_4_5"))
-        width = size_config["width"]
-        height = size_config["height"]
-        if width > 1536 or height > 1536:
-            scale = 1536 / max(width, height)
-            width = int(width * scale) // 8 * 8
-            height = int(height * scale) // 8 * 8
-
-        for prompt_id in job.prompt_ids:
-            if job.status == BatchStatus.CANCELLED:
-                break
+        width, height = generation_dims(job.size_id if job.size_id in sizes else SizeKey.POSTER_4_5)
 
+        # Rate limiting: a single-slot token bucket refilled every
+        # delay_between seconds caps generation starts independently of
+        # how many prompts are in flight.
+        tokens: asyncio.Queue = asyncio.Queue(maxsize=1)
+        tokens.put_nowait(None)
+        refill = asyncio.create_task(self._refill_tokens(tokens, job.delay_between))
+
+        # Writes nothing else waits on (failed-generation status) run in the
+        # background; the number outstanding is bounded by _bounded_gather.
+        background: set = set()
+
+        def _prepare(prompt_id: str) -> Optional[tuple]:
+            """Resolve a prompt's text; returns None if the item was skipped."""
             item = job.items[prompt_id]
-            item.status = "generating"
+            job._set_item_status(item, "generating")
             item.started_at = time.time()
 
+            # Get prompt from library
+            lib_prompt = job.prompts_cache.get(prompt_id) or prompt_lib.get_prompt(prompt_id)
+            if not lib_prompt:
+                job._set_item_status(item, "skipped")
+                item.error = "Prompt not found in library"
+                return None
+
+            item.prompt_name = lib_prompt["name"]
+
+            # Choose prompt text (main or variation)
+            prompt_text = lib_prompt["prompt"]
+            if job.use_variations and job.variation_index is not None:
+                variations = lib_prompt.get("variations", [])
+                if 0 <= job.variation_index < len(variations):
+                    prompt_text = variations[job.variation_index]
+
+            neg_prompt = lib_prompt.get("negative_prompt", "")
+            return item, lib_prompt, prompt_text, neg_prompt
+
+        def _fail(item: BatchItemResult, error: str):
+            job._set_item_status(item, "failed")
+            item.error = error
+            item.completed_at = time.time()
+
+        async def _start_group(group: list) -> list:
+            """Start generations for a group of prompts over one connection.
+
+            Each prompt takes its own rate-limit token and its create is sent
+            as soon as that token arrives, so creates keep the token spacing;
+            the group only shares a pooled Leonardo connection.
+            """
+            tasks, posts = [], []
+            async with leonardo.session() as client:
+                for prompt_id in group:
+                    await tokens.get()
+                    if job.status == BatchStatus.CANCELLED:
+                        break
+                    try:
+                        p = _prepare(prompt_id)
+                    except Exception as e:
+                        _fail(job.items[prompt_id], str(e))
+                        continue
+                    if not p:
+                        continue
+                    item, _, prompt_text, neg_prompt = p
+                    post = asyncio.create_task(leonardo.create_generation(
+                        # Add composition suffix for crop safety
+                        prompt=prompt_text + COMPOSITION_SUFFIX,
+                        width=width,
+                        height=height,
+                        num_images=job.num_images_per_prompt,
+                        model_id=model_uuid,
+                        negative_prompt=neg_prompt,
+                        client=client,
+                    ))
+                    posts.append(post)
+                    tasks.append(asyncio.create_task(_started(post, prompt_id, *p)))
+                # Keep the connection open until every create has been sent
+                if posts:
+                    await asyncio.wait(posts)
+            return tasks
+
+        async def _started(post, prompt_id, item, lib_prompt, prompt_text, neg_prompt):
+            """Wait for a generation's create call, then follow it to completion."""
             try:
-                # Get prompt from library
-                lib_prompt = prompt_lib.get_prompt(prompt_id)
-                if not lib_prompt:
-                    item.status = "skipped"
-                    item.error = "Prompt not found in library"
-                    continue
-
-                item.prompt_name = lib_prompt["name"]
-
-                # Choose prompt text (main or variation)
-                prompt_text = lib_prompt["prompt"]
-                if job.use_variations and job.variation_index is not None:
-                    variations = lib_prompt.get("variations", [])
-                    if 0 <= job.variation_index < len(variations):
-                        prompt_text = variations[job.variation_index]
-
-                neg_prompt = lib_prompt.get("negative_prompt", "")
-
-                # Add composition suffix for crop safety
-                from sizes import COMPOSITION_SUFFIX
-                generation_prompt = prompt_text + COMPOSITION_SUFFIX
-
-                # Start generation
-                result = await leonardo.create_generation(
-                    prompt=generation_prompt,
-                    model_id=model_uuid,
-                    num_images=job.num_images_per_prompt,
-                    negative_prompt=neg_prompt,
-                    width=width,
-                    height=height,
-                )
-
-                gen_id = result["generation_id"]
-                item.generation_id = gen_id
+                result = await post
+            except Exception as e:
+                _fail(item, str(e))
+                return
+            await _finish(prompt_id, item, lib_prompt, prompt_text, neg_prompt, result["generation_id"])
 
+        async def _finish(prompt_id, item, lib_prompt, prompt_text, neg_prompt, gen_id):
+            """Record a started generation, wait for it and store the images."""
+            item.generation_id = gen_id
+            try:
                 # Save to DB
-                await db.save_generation(
-                    generation_id=gen_id,
-                    prompt=prompt_text,
-                    negative_prompt=neg_prompt,
-                    model_id=model_uuid,
-                    model_name=model_config.get("name", job.model_id),
-                    style=lib_prompt.get("category", ""),
-                    preset=prompt_id,
-                    width=width,
-                    height=height,
-                    num_images=job.num_images_per_prompt,
-                )
+                async with self._db_sem:
+                    await db.save_generation(
+                        generation_id=gen_id,
+                        prompt=prompt_text,
+                        negative_prompt=neg_prompt,
+                        model_id=model_uuid,
+                        model_name=model_name,
+                        style=lib_prompt.get("category", ""),
+                        preset=prompt_id,
+                        width=width,
+                        height=height,
+                        num_images=job.num_images_per_prompt,
+                    )
 
                 # Poll for completion
                 gen_result = await leonardo.wait_for_generation(
                     gen_id,
-                    poll_interval=3.0,
+                    poll_interval=1.0,
+                    poll_factor=1.5,
+                    poll_max=5.0,
+                    jitter=0.15,
                     timeout=120.0,
                 )
 
                 if gen_result["status"] == "COMPLETE":
-                    item.status = "complete"
                     item.images = gen_result.get("images", [])
 
-                    # Save images to DB
+                    # Save images before marking the generation COMPLETE; a
+                    # failed save fails the item (handled below)
                     if item.images:
-                        await db.save_generated_images(gen_id, item.images)
+                        async with self._db_sem:
+                            await db.save_generated_images(gen_id, item.images)
 
                     # Update generation status
-                    await db.update_generation_status(
-                        gen_id, "COMPLETE",
-                        api_credit_cost=gen_result.get("api_credit_cost", 0),
-                    )
+                    async with self._db_sem:
+                        await db.update_generation_status(
+                            gen_id, "COMPLETE",
+                            api_credit_cost=gen_result.get("api_credit_cost", 0),
+                        )
+                    job._set_item_status(item, "complete")
                 else:
-                    item.status = "failed"
+                    job._set_item_status(item, "failed")
                     item.error = f"Generation status: {gen_result['status']}"
-                    await db.update_generation_status(
-                        gen_id, gen_result["status"],
-                        error_message=item.error,
+                    await self._bounded_gather(
+                        background,
+                        self._db_write(
+                            db.update_generation_status,
+                            gen_id, gen_result["status"],
+                            error_message=item.error,
+                        ),
+                        self._db_concurrency,
                     )
 
                 item.completed_at = time.time()
 
             except Exception as e:
-                item.status = "failed"
-                item.error = str(e)
-                item.completed_at = time.time()
-
-            # Rate limiting
-            if job.status == BatchStatus.RUNNING:
-                await asyncio.sleep(job.delay_between)
+                _fail(item, str(e))
+
+        # Bounded pool: keep up to `concurrency` prompts in flight. Free slots
+        # are refilled in groups of up to batch_size prompts sharing one connection.
+        pending: set = set()
+        prompt_ids = job.prompt_ids
+        n = len(prompt_ids)
+        i = 0
+        try:
+            while pending or i < n:
+                free = job.concurrency - len(pending)
+                if free > 0 and i < n and job.status != BatchStatus.CANCELLED:
+                    group = prompt_ids[i:i + min(free, job.batch_size)]
+                    i += len(group)
+                    pending.update(await _start_group(group))
+                    continue
+                if not pending:
+                    break
+                _, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+            if background:
+                await asyncio.wait(set(background))
+        finally:
+            refill.cancel()
 
         # Mark batch complete
         if job.status != BatchStatus.CANCELLED:
@@ -267,17 +404,53 @@ class BatchManager:
 
         # Notify batch completion
         if self._notifier:
-            completed_count = sum(1 for i in job.items.values() if i.status == "complete")
-            failed_count = sum(1 for i in job.items.values() if i.status == "failed")
+            # Fire-and-forget so a slow notifier never holds the batch task
+            task = asyncio.create_task(self._notify_safe(
+                batch_id=batch_id,
+                total=len(job.items),
+                completed=job.complete_count,
+                failed=job.failed_count,
+            ))
+            self._notify_tasks.add(task)
+            task.add_done_callback(self._notify_tasks.discard)
+
+    async def _notify_safe(self, **kwargs):
+        """Send the batch-completed notification, giving up after 5s."""
+        try:
+            await asyncio.wait_for(
+                self._notifier.notify_batch_completed(**kwargs), timeout=5.0
+            )
+        except Exception as e:
+            # Don't fail batch for notification issues
+            logger.warning("Batch %s notification dropped: %s", kwargs.get("batch_id"), e)
+
+    async def _db_write(self, fn, *args, **kwargs):
+        """Run a DB write under the shared DB semaphore, logging failures."""
+        try:
+            async with self._db_sem:
+                await fn(*args, **kwargs)
+        except Exception as e:
+            logger.warning("Batch DB write %s failed: %s", fn.__name__, e)
+
+    @staticmethod
+    async def _bounded_gather(background: set, coro, limit: int):
+        """Schedule coro as a background task, waiting while more than
+        `limit` tasks are outstanding so backpressure reaches the caller."""
+        task = asyncio.create_task(coro)
+        background.add(task)
+        task.add_done_callback(background.discard)
+        while len(background) > limit:
+            await asyncio.wait(set(background), return_when=asyncio.FIRST_COMPLETED)
+
+    @staticmethod
+    async def _refill_tokens(tokens: asyncio.Queue, interval: float):
+        """Add one start token every `interval` seconds (bucket size 1)."""
+        while True:
+            await asyncio.sleep(interval)
             try:
-                await self._notifier.notify_batch_completed(
-                    batch_id=batch_id,
-                    total=len(job.items),
-                    completed=completed_count,
-                    failed=failed_count,
-                )
-            except Exception:
-                pass  # Don't fail batch for notification issues
+                tokens.put_nowait(None)
+            except asyncio.QueueFull:
+                pass
 
     def start_batch(self, batch_id: str, leonardo, db, prompt_lib, models, sizes):
         """Launch batch as asyncio background task."""
@@ -4,8 +4,17 @@ Matches product tags and style against keyword dictionaries
 to determine category slugs (style + room).
 """
 
+import operator
+import re
+import sys
+
 from prompts import STYLE_KEYWORDS
 
+try:
+    import ahocorasick
+except ImportError:  # optional C extension — fall back to one compiled regex
+    ahocorasick = None
+
 # Style category keywords — slug → list of trigger words
 STYLE_CATEGORIES = {
     "japanese": [
@@ -94,33 +103,70 @@ _ROOM_SLUG_MAP = {
 }
 
 
-def categorize_product(tags: list[str] | None, style: str | None = None) -> list[str]:
-    """Determine category slugs for a product from its tags and style.
+def _build_matcher(by_keyword: dict, combine):
+    """Compile keyword → value pairs into a single multi-pattern matcher.
 
-    Returns sorted list of unique category slugs, e.g.:
-    ["bedroom", "gift-ideas", "japanese", "living-room"]
+    Returns a function text → iterable of the values of every keyword
+    occurrence in text. Uses a pyahocorasick automaton when installed,
+    otherwise one stdlib regex alternation; `combine` merges the values of
+    keywords that match at the same position in the regex fallback.
     """
-    categories: set[str] = set()
-    tags_lower = [t.lower() for t in (tags or [])]
-    tags_text = " ".join(tags_lower)
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for kw, value in by_keyword.items():
+            automaton.add_word(kw, value)
+        automaton.make_automaton()
+        return lambda text: (value for _, value in automaton.iter(text))
 
-    # 1. Style from generation metadata (highest confidence)
-    if style and style in STYLE_CATEGORIES:
-        categories.add(style)
+    # A longest-first alternation inside a lookahead reports the longest
+    # keyword at every position. Any shorter keyword matching there is a
+    # prefix of it, so fold prefix values into each keyword's value.
+    # (google-re2 would be faster but has no lookahead support.)
+    values = {}
+    for kw, value in by_keyword.items():
+        for other, other_value in by_keyword.items():
+            if kw.startswith(other):
+                value = combine(value, other_value)
+        values[kw] = value
+    pattern = re.compile("(?=(%s))" % "|".join(
+        re.escape(kw) for kw in sorted(by_keyword, key=len, reverse=True)
+    ))
+    return lambda text: (values[m.group(1)] for m in pattern.finditer(text))
 
-    # 2. Scan tags for style keywords
-    for slug, keywords in STYLE_CATEGORIES.items():
-        for kw in keywords:
-            if kw in tags_text:
-                categories.add(slug)
-                break
 
-    # 3. Scan tags for room keywords
-    for slug, keywords in ROOM_CATEGORIES.items():
+# Fixed slug universe in output order; each slug owns one bit of a mask
+_ALL_SLUGS = tuple(sys.intern(s) for s in sorted({*STYLE_CATEGORIES, *ROOM_CATEGORIES}))
+_SLUG_BIT = {slug: 1 << i for i, slug in enumerate(_ALL_SLUGS)}
+
+
+def _keyword_bits(table: dict[str, list[str]]) -> dict[str, int]:
+    """keyword → OR of the bits of every slug it triggers ("beach" hits two)."""
+    bits: dict[str, int] = {}
+    for slug, keywords in table.items():
         for kw in keywords:
-            if kw in tags_text:
-                categories.add(slug)
-                break
+            bits[kw] = bits.get(kw, 0) | _SLUG_BIT[slug]
+    return bits
+
+
+_STYLE_MATCH = _build_matcher(_keyword_bits(STYLE_CATEGORIES), operator.or_)
+_ROOM_MATCH = _build_matcher(_keyword_bits(ROOM_CATEGORIES), operator.or_)
+
+
+def _match_mask(match, text: str) -> int:
+    """Return the slug mask of every keyword found inside text."""
+    mask = 0
+    for bit in match(text):
+        mask |= bit
+    return mask
+
+
+def _style_mask(style: str | None) -> int:
+    """Slug mask implied by the generation style alone (steps 1 and 4)."""
+    mask = 0
+
+    # 1. Style from generation metadata (highest confidence)
+    if style and style in STYLE_CATEGORIES:
+        mask |= _SLUG_BIT[style]
 
     # 4. Use STYLE_KEYWORDS default rooms as fallback
     if style and style in STYLE_KEYWORDS:
@@ -128,11 +174,57 @@ def categorize_product(tags: list[str] | None, style: str | None = None) -> list
         for room in sk.get("rooms", []):
             mapped = _ROOM_SLUG_MAP.get(room)
             if mapped:
-                categories.add(mapped)
+                mask |= _SLUG_BIT[mapped]
         if sk.get("occasions"):
-            categories.add("gift-ideas")
+            mask |= _SLUG_BIT["gift-ideas"]
+
+    return mask
+
 
-    return sorted(categories)
+def _mask_slugs(mask: int) -> list[str]:
+    return [slug for slug, bit in _SLUG_BIT.items() if mask & bit]
+
+
+# style → categories when a product has no tags (the common generated case)
+_STYLE_FASTPATH = {
+    style: tuple(_mask_slugs(_style_mask(style))) for style in STYLE_CATEGORIES
+}
+
+
+def join_tags(tags: list[str] | None) -> str:
+    """Lowercase and space-join tags into the text the keyword scans search.
+
+    Callers that categorize and pick a collection for the same product can
+    compute this once and pass it to both as tags_joined_lower.
+    """
+    return " ".join(t.lower() for t in (tags or []))
+
+
+def categorize_product(
+    tags: list[str] | None,
+    style: str | None = None,
+    tags_joined_lower: str | None = None,
+) -> list[str]:
+    """Determine category slugs for a product from its tags and style.
+
+    Returns sorted list of unique category slugs, e.g.:
+    ["bedroom", "gift-ideas", "japanese", "living-room"]
+    """
+    if not tags and style in _STYLE_FASTPATH:
+        return list(_STYLE_FASTPATH[style])
+
+    tags_text = join_tags(tags) if tags_joined_lower is None else tags_joined_lower
+
+    # 1 + 4. Style and its default rooms / occasions
+    mask = _style_mask(style)
+
+    # 2. Scan tags for style keywords
+    mask |= _match_mask(_STYLE_MATCH, tags_text)
+
+    # 3. Scan tags for room keywords
+    mask |= _match_mask(_ROOM_MATCH, tags_text)
+
+    return _mask_slugs(mask)
 
 
 # DovShop collection keywords — slug → list of trigger words (checked against name + tags)
@@ -183,19 +275,31 @@ COLLECTION_KEYWORDS = {
     ],
 }
 
+_COLLECTION_SLUGS = tuple(sys.intern(s) for s in COLLECTION_KEYWORDS)
+# keyword → index of the first collection it belongs to (dict order = priority)
+_COLLECTION_MATCH = _build_matcher({
+    kw: order
+    for order, keywords in reversed(list(enumerate(COLLECTION_KEYWORDS.values())))
+    for kw in keywords
+}, min)
 
-def get_collection_slug(name: str, tags: list[str] | None = None) -> str | None:
+
+def get_collection_slug(
+    name: str,
+    tags: list[str] | None = None,
+    tags_joined_lower: str | None = None,
+) -> str | None:
     """Determine the DovShop collection slug for a product.
 
     Matches product name and tags against keyword dictionaries.
     Returns the first matching collection slug, or None.
     """
+    if tags_joined_lower is None and tags:
+        tags_joined_lower = join_tags(tags)
     search_text = name.lower()
-    if tags:
-        search_text += " " + " ".join(t.lower() for t in tags)
+    if tags_joined_lower:
+        search_text = search_text + " " + tags_joined_lower
 
-    for slug, keywords in COLLECTION_KEYWORDS.items():
-        for kw in keywords:
-            if kw in search_text:
-                return slug
-    return None
+    # Keep dict-order priority: the earliest collection with any hit wins
+    best = min(_COLLECTION_MATCH(search_text), default=None)
+    return None if best is None else _COLLECTION_SLUGS[best]
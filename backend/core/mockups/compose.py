@@ -4,16 +4,18 @@ Extracted from routes/mockup_utils.py — pure business logic with no FastAPI
 dependencies.  Used by scheduler.py and route handlers.
 """
 
+import base64
 import io
 import json
 import logging
-from typing import List, Tuple
+from typing import Callable, List, Optional, Tuple
 
 from PIL import Image, ImageEnhance
 import numpy as np
 import httpx
 
-from config import COLOR_GRADE_PRESETS
+import database as db
+from config import COLOR_GRADE_PRESETS, ColorGradeKey, grade_params
 
 logger = logging.getLogger(__name__)
 
@@ -165,32 +167,65 @@ def _find_perspective_coeffs(src_points, dst_points):
     return tuple(coeffs.tolist())
 
 
-def apply_color_grade(img: Image.Image, preset_name: str) -> Image.Image:
-    """Apply color grade preset to a PIL Image. Returns graded image."""
-    preset = COLOR_GRADE_PRESETS.get(preset_name)
-    if not preset or preset_name == "none":
-        return img
+GradeFn = Callable[[Image.Image], Image.Image]
 
-    result = img.copy()
 
-    if preset["brightness"] != 1.0:
-        result = ImageEnhance.Brightness(result).enhance(preset["brightness"])
+def _build_grade(warmth: float, brightness: float, saturation: float, contrast: float) -> GradeFn:
+    """Compose one preset's enhance steps into a single function.
+
+    Steps whose factor is neutral are dropped here, once, instead of being
+    re-checked for every graded image.
+    """
+    steps: List[GradeFn] = []
+
+    if brightness != 1.0:
+        steps.append(lambda im: ImageEnhance.Brightness(im).enhance(brightness))
 
-    if preset["saturation"] != 1.0:
-        result = ImageEnhance.Color(result).enhance(preset["saturation"])
+    if saturation != 1.0:
+        steps.append(lambda im: ImageEnhance.Color(im).enhance(saturation))
 
-    if preset["contrast"] != 1.0:
-        result = ImageEnhance.Contrast(result).enhance(preset["contrast"])
+    if contrast != 1.0:
+        steps.append(lambda im: ImageEnhance.Contrast(im).enhance(contrast))
 
-    warmth = preset.get("warmth", 0)
     if warmth > 0:
-        arr = np.array(result, dtype=np.float32)
         factor = warmth / 100.0
-        arr[:, :, 0] = np.clip(arr[:, :, 0] * (1 + factor * 0.25), 0, 255)  # R boost
-        arr[:, :, 2] = np.clip(arr[:, :, 2] * (1 - factor * 0.35), 0, 255)  # B reduce
-        result = Image.fromarray(arr.astype(np.uint8))
+        r_gain = 1 + factor * 0.25  # R boost
+        b_gain = 1 - factor * 0.35  # B reduce
 
-    return result
+        def warm(im: Image.Image) -> Image.Image:
+            arr = np.array(im, dtype=np.float32)
+            arr[:, :, 0] = np.clip(arr[:, :, 0] * r_gain, 0, 255)
+            arr[:, :, 2] = np.clip(arr[:, :, 2] * b_gain, 0, 255)
+            return Image.fromarray(arr.astype(np.uint8))
+
+        steps.append(warm)
+
+    if not steps:
+        return lambda img: img.copy()
+
+    def apply(img: Image.Image) -> Image.Image:
+        # Every step returns a new image, so the input is never modified
+        for step in steps:
+            img = step(img)
+        return img
+
+    return apply
+
+
+# preset key → grading function ("none" is absent: it returns the input as-is)
+_GRADE_PIPELINES = {
+    key: _build_grade(*grade_params(key).tolist())
+    for key in COLOR_GRADE_PRESETS
+    if key != ColorGradeKey.NONE
+}
+
+
+def apply_color_grade(img: Image.Image, preset_name: str) -> Image.Image:
+    """Apply color grade preset to a PIL Image. Returns graded image."""
+    pipeline = _GRADE_PIPELINES.get(preset_name)
+    if pipeline is None:
+        return img
+    return pipeline(img)
 
 
 # --- Main Functions (used by scheduler.py) ---
@@ -293,6 +328,32 @@ async def compose_all_templates(
     return results
 
 
+
+async def save_composed_mockups(
+    image_id: Optional[int],
+    composed: List[Tuple[int, bytes]],
+    pack_id: Optional[int] = None,
+    replace: bool = False,
+) -> List[Tuple[Optional[int], bytes]]:
+    """Store composed mockups for an image. Returns list of (mockup_id, png_bytes).
+
+    Ranks start at 2 (rank 1 is the poster itself). Without an image_id
+    nothing is stored and every mockup_id is None.
+    """
+    if image_id is None:
+        return [(None, png_bytes) for _, png_bytes in composed]
+    saved_ids = await db.save_image_mockups_bulk(
+        image_id,
+        [
+            (tid, f"data:image/png;base64,{base64.b64encode(png_bytes).decode()}", rank_idx)
+            for rank_idx, (tid, png_bytes) in enumerate(composed, start=2)
+        ],
+        pack_id=pack_id,
+        replace=replace,
+    )
+    return [(mockup_id, png_bytes) for mockup_id, (_, png_bytes) in zip(saved_ids, composed)]
+
+
 async def upload_multi_images_to_etsy(
     access_token: str,
     shop_id: str,
@@ -1,6 +1,9 @@
 """Product analytics queries — views, favorites, orders, revenue."""
 
 from typing import Optional, List, Dict, Any
+
+import asyncpg
+
 from db.connection import get_pool
 
 
@@ -32,27 +35,94 @@ async def save_analytics(
         )
 
 
-async def get_analytics_summary(limit: int = 500, offset: int = 0) -> List[Dict[str, Any]]:
-    """Get aggregated analytics per product (paginated)."""
+ANALYTICS_METRICS = ("views", "favorites", "orders", "revenue_cents")
+
+
+async def save_analytics_bulk(
+    rows: List[Dict[str, Any]],
+    update: tuple = ANALYTICS_METRICS,
+) -> None:
+    """Upsert many analytics entries in one executemany batch.
+
+    Each row needs printify_product_id and date; missing metrics default to
+    0 for new entries. On conflict only the metrics named in `update` (and
+    notes) are overwritten, so a views sync keeps stored orders/revenue
+    without reading them first.
+    """
+    if not rows:
+        return
+    set_clause = ",\n".join(
+        f"{col} = EXCLUDED.{col}" for col in (*update, "notes")
+    )
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        await conn.executemany(
+            f"""
+            INSERT INTO product_analytics
+            (printify_product_id, date, views, favorites, orders, revenue_cents, notes)
+            VALUES ($1, $2, $3, $4, $5, $6, $7)
+            ON CONFLICT(printify_product_id, date) DO UPDATE SET
+                {set_clause}
+            """,
+            [
+                (
+                    r["printify_product_id"], r["date"],
+                    r.get("views", 0), r.get("favorites", 0),
+                    r.get("orders", 0), r.get("revenue_cents", 0),
+                    r.get("notes"),
+                )
+                for r in rows
+            ],
+        )
+
+
+async def refresh_analytics_rollup() -> None:
+    """Rebuild the per-product rollup after a batch of analytics writes."""
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        # Full re-aggregation: exempt from the pool's short command_timeout
+        await conn.execute(
+            "REFRESH MATERIALIZED VIEW CONCURRENTLY product_analytics_rollup",
+            timeout=120,
+        )
+
+
+async def get_analytics_summary(limit: int = 500, offset: int = 0) -> List[asyncpg.Record]:
+    """Get aggregated analytics per product (paginated).
+
+    Rows are returned as read-only Records (they support [] and .get());
+    every caller only reads them while merging into its own dicts.
+    """
     pool = await get_pool()
     async with pool.acquire() as conn:
         rows = await conn.fetch(
             """
-            SELECT
-                printify_product_id,
-                COALESCE(MAX(views), 0) as total_views,
-                COALESCE(MAX(favorites), 0) as total_favorites,
-                COALESCE(SUM(orders), 0) as total_orders,
-                COALESCE(SUM(revenue_cents), 0) as total_revenue_cents,
-                MAX(date) as latest_date
-            FROM product_analytics
-            GROUP BY printify_product_id
+            SELECT printify_product_id, total_views, total_favorites,
+                   total_orders, total_revenue_cents, latest_date
+            FROM product_analytics_rollup
             ORDER BY total_views DESC
             LIMIT $1 OFFSET $2
             """,
             limit, offset,
         )
-        return [dict(row) for row in rows]
+        return rows
+
+
+async def get_analytics_grand_totals() -> Dict[str, Any]:
+    """Totals across all products (count, views, favorites, orders, revenue)."""
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow(
+            """
+            SELECT COUNT(*) as product_count,
+                   COALESCE(SUM(total_views), 0) as total_views,
+                   COALESCE(SUM(total_favorites), 0) as total_favorites,
+                   COALESCE(SUM(total_orders), 0) as total_orders,
+                   COALESCE(SUM(total_revenue_cents), 0) as total_revenue_cents
+            FROM product_analytics_rollup
+            """
+        )
+        return dict(row)
 
 
 async def get_product_analytics_history(
@@ -93,7 +163,7 @@ async def get_analytics_totals_for_period(days: int = 7) -> Dict[str, Any]:
                        SUM(orders) as sum_orders,
                        SUM(revenue_cents) as sum_revenue
                 FROM product_analytics
-                WHERE date >= (CURRENT_DATE - $1 * INTERVAL '1 day')::date::text
+                WHERE date >= to_char(CURRENT_DATE - $1::int, 'YYYY-MM-DD')
                 GROUP BY printify_product_id
             ) sub
             """,
@@ -118,7 +188,7 @@ async def get_daily_views_chart(days: int = 30) -> List[Dict[str, Any]]:
             WITH snapshots AS (
                 SELECT date, printify_product_id, MAX(views) as views
                 FROM product_analytics
-                WHERE date >= (CURRENT_DATE - ($1 + 1) * INTERVAL '1 day')::date::text
+                WHERE date >= to_char(CURRENT_DATE - ($1::int + 1), 'YYYY-MM-DD')
                 GROUP BY date, printify_product_id
             ),
             deltas AS (
@@ -130,7 +200,7 @@ async def get_daily_views_chart(days: int = 30) -> List[Dict[str, Any]]:
             )
             SELECT date, GREATEST(SUM(new_views), 0) as views
             FROM deltas
-            WHERE date >= (CURRENT_DATE - $1 * INTERVAL '1 day')::date::text
+            WHERE date >= to_char(CURRENT_DATE - $1::int, 'YYYY-MM-DD')
             GROUP BY date
             ORDER BY date ASC
             """,
@@ -145,13 +215,9 @@ async def get_top_products(limit: int = 5) -> List[Dict[str, Any]]:
     async with pool.acquire() as conn:
         rows = await conn.fetch(
             """
-            SELECT printify_product_id,
-                   COALESCE(MAX(views), 0) as total_views,
-                   COALESCE(MAX(favorites), 0) as total_favorites,
-                   COALESCE(SUM(orders), 0) as total_orders,
-                   COALESCE(SUM(revenue_cents), 0) as total_revenue_cents
-            FROM product_analytics
-            GROUP BY printify_product_id
+            SELECT printify_product_id, total_views, total_favorites,
+                   total_orders, total_revenue_cents
+            FROM product_analytics_rollup
             ORDER BY total_views DESC
             LIMIT $1
             """,
@@ -188,14 +254,14 @@ async def get_listing_trends(
                 SELECT date, views, favorites, orders, revenue_cents
                 FROM product_analytics
                 WHERE printify_product_id = $1
-                  AND date >= (CURRENT_DATE - ($2 + 1) * INTERVAL '1 day')::date::text
+                  AND date >= to_char(CURRENT_DATE - ($2::int + 1), 'YYYY-MM-DD')
                 ORDER BY date
             )
             SELECT date, views, favorites, orders, revenue_cents,
                    views - COALESCE(LAG(views) OVER (ORDER BY date), 0) AS new_views,
                    favorites - COALESCE(LAG(favorites) OVER (ORDER BY date), 0) AS new_favorites
             FROM snapshots
-            WHERE date >= (CURRENT_DATE - $2 * INTERVAL '1 day')::date::text
+            WHERE date >= to_char(CURRENT_DATE - $2::int, 'YYYY-MM-DD')
             """,
             printify_product_id, days,
         )
@@ -215,7 +281,7 @@ async def get_dead_listings(days: int = 14, min_age_days: int = 7) -> List[Dict[
                        MAX(favorites) AS latest_favorites,
                        MIN(date) AS first_date
                 FROM product_analytics
-                WHERE date >= (CURRENT_DATE - $1 * INTERVAL '1 day')::date::text
+                WHERE date >= to_char(CURRENT_DATE - $1::int, 'YYYY-MM-DD')
                 GROUP BY printify_product_id
                 HAVING COUNT(*) >= 2
             )
@@ -226,7 +292,7 @@ async def get_dead_listings(days: int = 14, min_age_days: int = 7) -> List[Dict[
                    first_date
             FROM recent
             WHERE latest_views - earliest_views = 0
-              AND first_date <= (CURRENT_DATE - $2 * INTERVAL '1 day')::date::text
+              AND first_date <= to_char(CURRENT_DATE - $2::int, 'YYYY-MM-DD')
             ORDER BY latest_views DESC
             """,
             days, min_age_days,
@@ -249,7 +315,7 @@ async def get_top_performers(days: int = 7, limit: int = 10) -> List[Dict[str, A
                        COALESCE(SUM(orders), 0) AS period_orders,
                        COALESCE(SUM(revenue_cents), 0) AS period_revenue_cents
                 FROM product_analytics
-                WHERE date >= (CURRENT_DATE - $1 * INTERVAL '1 day')::date::text
+                WHERE date >= to_char(CURRENT_DATE - $1::int, 'YYYY-MM-DD')
                 GROUP BY printify_product_id
                 HAVING COUNT(*) >= 2
             )
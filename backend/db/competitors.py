@@ -1,6 +1,11 @@
 """Competitor intelligence queries — shops, listings, snapshots, stats."""
 
-from typing import Optional, List, Dict, Any
+import functools
+from contextlib import asynccontextmanager
+from typing import Optional, List, Dict, Any, AsyncIterator
+
+import asyncpg
+
 from db.connection import get_pool
 
 
@@ -52,13 +57,15 @@ async def get_competitor_by_shop_id(etsy_shop_id: str) -> Optional[Dict[str, Any
         return dict(row) if row else None
 
 
-async def archive_competitor(competitor_id: int) -> None:
+async def archive_competitor(competitor_id: int) -> bool:
+    """Soft-delete a competitor. Returns False if no such competitor exists."""
     pool = await get_pool()
     async with pool.acquire() as conn:
-        await conn.execute(
-            "UPDATE competitors SET is_active = 0, updated_at = NOW() WHERE id = $1",
+        updated = await conn.fetchval(
+            "UPDATE competitors SET is_active = 0, updated_at = NOW() WHERE id = $1 RETURNING 1",
             competitor_id,
         )
+        return updated is not None
 
 
 async def reactivate_competitor(competitor_id: int) -> None:
@@ -72,21 +79,31 @@ async def reactivate_competitor(competitor_id: int) -> None:
 
 async def update_competitor(competitor_id: int, **fields) -> None:
     pool = await get_pool()
-    allowed = {"total_listings", "rating", "total_reviews", "icon_url", "shop_name"}
-    parts = []
-    values = []
-    idx = 2  # $1 is competitor_id
-    for key, val in fields.items():
-        if key in allowed:
-            parts.append(f"{key} = ${idx}")
-            values.append(val)
-            idx += 1
-    if not parts:
-        return
-    parts.append("updated_at = NOW()")
-    sql = f"UPDATE competitors SET {', '.join(parts)} WHERE id = $1"
     async with pool.acquire() as conn:
-        await conn.execute(sql, competitor_id, *values)
+        await _update_competitor(conn, competitor_id, **fields)
+
+
+_UPDATABLE_COMPETITOR_FIELDS = frozenset(
+    {"total_listings", "rating", "total_reviews", "icon_url", "shop_name"}
+)
+
+
+@functools.lru_cache(maxsize=64)
+def _update_competitor_sql(keys: frozenset) -> tuple[str, tuple[str, ...]]:
+    """SQL and bind order for one field subset (sorted, so kwarg order
+    doesn't produce distinct statements)."""
+    order = tuple(sorted(keys))
+    parts = [f"{key} = ${idx}" for idx, key in enumerate(order, start=2)]  # $1 is competitor_id
+    parts.append("updated_at = NOW()")
+    return f"UPDATE competitors SET {', '.join(parts)} WHERE id = $1", order
+
+
+async def _update_competitor(conn: asyncpg.Connection, competitor_id: int, **fields) -> None:
+    keys = _UPDATABLE_COMPETITOR_FIELDS.intersection(fields)
+    if not keys:
+        return
+    sql, order = _update_competitor_sql(keys)
+    await conn.execute(sql, competitor_id, *(fields[k] for k in order))
 
 
 async def upsert_competitor_listing(
@@ -124,24 +141,100 @@ async def upsert_competitor_listing(
         return dict(row)
 
 
+async def upsert_competitor_listings_bulk(rows: List[tuple]) -> Dict[str, int]:
+    """Upsert many listings in one statement.
+
+    Each row is (competitor_id, etsy_listing_id, title, description, tags,
+    price_cents, currency, views, favorites, image_url), matching
+    upsert_competitor_listing. Returns {etsy_listing_id: listing row id}.
+    """
+    if not rows:
+        return {}
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        return await _upsert_competitor_listings_bulk(conn, rows)
+
+
+async def _upsert_competitor_listings_bulk(conn: asyncpg.Connection, rows: List[tuple]) -> Dict[str, int]:
+    # ON CONFLICT can't touch the same row twice in one statement: last wins
+    rows = list({r[1]: r for r in rows}.values())
+    result = await conn.fetch(
+        """INSERT INTO competitor_listings
+           (competitor_id, etsy_listing_id, title, description, tags, price_cents, currency, views, favorites, image_url)
+           SELECT * FROM unnest(
+             $1::int[], $2::text[], $3::text[], $4::text[], $5::text[],
+             $6::int[], $7::text[], $8::int[], $9::int[], $10::text[]
+           )
+           ON CONFLICT(etsy_listing_id) DO UPDATE SET
+             title = EXCLUDED.title,
+             description = EXCLUDED.description,
+             tags = EXCLUDED.tags,
+             price_cents = EXCLUDED.price_cents,
+             currency = EXCLUDED.currency,
+             views = EXCLUDED.views,
+             favorites = EXCLUDED.favorites,
+             image_url = EXCLUDED.image_url,
+             synced_at = NOW()
+           RETURNING id, etsy_listing_id""",
+        *(list(col) for col in zip(*rows)),
+    )
+    return {r["etsy_listing_id"]: r["id"] for r in result}
+
+
+# Sort column -> NULL-free sort key. The sort columns are nullable, and a NULL
+# would make the keyset row comparison NULL and drop the row from every page;
+# the same expressions back the per-sort indexes in db.connection.
+_LISTING_SORT_KEYS = {
+    "views": "COALESCE(views, 0)",
+    "favorites": "COALESCE(favorites, 0)",
+    "price_cents": "COALESCE(price_cents, 0)",
+    "title": "COALESCE(title, '')",
+    "synced_at": "COALESCE(synced_at, '1970-01-01'::timestamp)",
+}
+
+
+@functools.lru_cache(maxsize=32)
+def _competitor_listings_sql(sort_by: str, sort_dir: str, keyset: bool) -> str:
+    """Listing page SQL per (sort, direction, pagination mode) — one stable
+    string each, so each maps to one cached prepared statement."""
+    key = _LISTING_SORT_KEYS[sort_by]
+    columns = f"""id, competitor_id, etsy_listing_id, title, tags, price_cents, currency,
+                       views, favorites, image_url, created_at, synced_at, {key} AS sort_key"""
+    # id breaks ties so keyset pages never skip or repeat rows
+    order = f"ORDER BY {key} {sort_dir}, id {sort_dir}"
+    if keyset:
+        op = ">" if sort_dir == "ASC" else "<"
+        return f"""SELECT {columns}
+                FROM competitor_listings
+                WHERE competitor_id = $1 AND ({key}, id) {op} ($2, $3)
+                {order} LIMIT $4"""
+    return f"""SELECT {columns}
+                FROM competitor_listings WHERE competitor_id = $1
+                {order} LIMIT $2 OFFSET $3"""
+
+
 async def get_competitor_listings(
     competitor_id: int,
     sort_by: str = "favorites",
     sort_dir: str = "DESC",
     limit: int = 50,
     offset: int = 0,
-) -> List[Dict[str, Any]]:
-    allowed_sort = {"views", "favorites", "price_cents", "title", "synced_at"}
-    if sort_by not in allowed_sort:
+    after: Optional[tuple] = None,
+) -> List[asyncpg.Record]:
+    """Page through a competitor's listings.
+
+    Pass after=(sort_key, id) from the last row of the previous page for
+    keyset pagination; offset is only used when after is None.
+    """
+    if sort_by not in _LISTING_SORT_KEYS:
         sort_by = "favorites"
     sort_dir = "ASC" if sort_dir.upper() == "ASC" else "DESC"
+    sql = _competitor_listings_sql(sort_by, sort_dir, after is not None)
     pool = await get_pool()
     async with pool.acquire() as conn:
-        rows = await conn.fetch(
-            f"SELECT * FROM competitor_listings WHERE competitor_id = $1 ORDER BY {sort_by} {sort_dir} LIMIT $2 OFFSET $3",
-            competitor_id, limit, offset,
-        )
-        return [dict(row) for row in rows]
+        if after is not None:
+            return await conn.fetch(sql, competitor_id, after[0], after[1], limit)
+        return await conn.fetch(sql, competitor_id, limit, offset)
 
 
 async def get_competitor_listings_count(competitor_id: int) -> int:
@@ -169,20 +262,92 @@ async def save_competitor_listing_stats(
         )
 
 
+async def save_competitor_listing_stats_bulk(rows: List[tuple]) -> None:
+    """Upsert many (listing_id, date, views, favorites, price_cents) rows at once."""
+    if not rows:
+        return
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        await _save_competitor_listing_stats_bulk(conn, rows)
+
+
+async def _save_competitor_listing_stats_bulk(conn: asyncpg.Connection, rows: List[tuple]) -> None:
+    rows = list({(r[0], r[1]): r for r in rows}.values())
+    await conn.execute(
+        """INSERT INTO competitor_listing_stats (listing_id, date, views, favorites, price_cents)
+           SELECT * FROM unnest($1::int[], $2::text[], $3::int[], $4::int[], $5::int[])
+           ON CONFLICT(listing_id, date) DO UPDATE SET
+             views = EXCLUDED.views,
+             favorites = EXCLUDED.favorites,
+             price_cents = EXCLUDED.price_cents""",
+        *(list(col) for col in zip(*rows)),
+    )
+
+
 async def save_competitor_snapshot(
     competitor_id: int, snapshot_date: str, total_listings: int, avg_price_cents: int, top_tags: str = "[]"
 ) -> None:
     pool = await get_pool()
     async with pool.acquire() as conn:
-        await conn.execute(
-            """INSERT INTO competitor_snapshots (competitor_id, snapshot_date, total_listings, avg_price_cents, top_tags)
-               VALUES ($1, $2, $3, $4, $5)
-               ON CONFLICT(competitor_id, snapshot_date) DO UPDATE SET
-                 total_listings = EXCLUDED.total_listings,
-                 avg_price_cents = EXCLUDED.avg_price_cents,
-                 top_tags = EXCLUDED.top_tags""",
-            competitor_id, snapshot_date, total_listings, avg_price_cents, top_tags,
+        await _save_competitor_snapshot(
+            conn, competitor_id, snapshot_date, total_listings, avg_price_cents, top_tags,
+        )
+
+
+async def _save_competitor_snapshot(
+    conn: asyncpg.Connection,
+    competitor_id: int, snapshot_date: str, total_listings: int, avg_price_cents: int, top_tags: str = "[]"
+) -> None:
+    await conn.execute(
+        """INSERT INTO competitor_snapshots (competitor_id, snapshot_date, total_listings, avg_price_cents, top_tags)
+           VALUES ($1, $2, $3, $4, $5)
+           ON CONFLICT(competitor_id, snapshot_date) DO UPDATE SET
+             total_listings = EXCLUDED.total_listings,
+             avg_price_cents = EXCLUDED.avg_price_cents,
+             top_tags = EXCLUDED.top_tags""",
+        competitor_id, snapshot_date, total_listings, avg_price_cents, top_tags,
+    )
+
+
+@asynccontextmanager
+async def scraper_tx() -> AsyncIterator[asyncpg.Connection]:
+    """One pooled connection inside one transaction for a whole scraper run."""
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            yield conn
+
+
+async def save_competitor_sync(
+    competitor_id: int,
+    listing_rows: List[tuple],
+    stats_by_listing: Dict[str, tuple],
+    snapshot_date: str,
+    avg_price_cents: int,
+    top_tags: str = "[]",
+) -> int:
+    """Persist a full competitor sync atomically: listings, their daily stats,
+    the shop snapshot and the competitor's listing count.
+
+    listing_rows are upsert_competitor_listings_bulk rows; stats_by_listing
+    maps etsy_listing_id to (views, favorites, price_cents).
+    Returns the number of distinct listings written (Etsy can return a
+    listing twice across pages; the upsert keeps one).
+    """
+    synced = 0
+    async with scraper_tx() as conn:
+        if listing_rows:
+            listing_ids = await _upsert_competitor_listings_bulk(conn, listing_rows)
+            synced = len(listing_ids)
+            await _save_competitor_listing_stats_bulk(conn, [
+                (listing_ids[etsy_id], snapshot_date, *stats)
+                for etsy_id, stats in stats_by_listing.items()
+            ])
+        await _save_competitor_snapshot(
+            conn, competitor_id, snapshot_date, synced, avg_price_cents, top_tags,
         )
+        await _update_competitor(conn, competitor_id, total_listings=synced)
+    return synced
 
 
 async def get_competitor_stats(competitor_id: int) -> Dict[str, Any]:
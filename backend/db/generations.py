@@ -1,6 +1,10 @@
 """Generation history, generated images, and credit usage queries."""
 
+import functools
 from typing import Optional, List, Dict, Any
+
+import orjson
+
 from db.connection import get_pool
 
 
@@ -43,24 +47,19 @@ async def update_generation_status(
     """Update generation status and credit cost."""
     pool = await get_pool()
     async with pool.acquire() as conn:
-        if status == "COMPLETE":
-            await conn.execute(
-                """
-                UPDATE generations
-                SET status = $1, api_credit_cost = $2, completed_at = NOW()
-                WHERE generation_id = $3
-                """,
-                status, api_credit_cost, generation_id,
-            )
-        else:
-            await conn.execute(
-                """
-                UPDATE generations
-                SET status = $1, api_credit_cost = $2, error_message = $3
-                WHERE generation_id = $4
-                """,
-                status, api_credit_cost, error_message, generation_id,
-            )
+        # One statement shape: COMPLETE stamps completed_at and keeps
+        # error_message; any other status records error_message instead
+        await conn.execute(
+            """
+            UPDATE generations
+            SET status = $1,
+                api_credit_cost = $2,
+                error_message = CASE WHEN $1 = 'COMPLETE' THEN error_message ELSE $3 END,
+                completed_at = CASE WHEN $1 = 'COMPLETE' THEN NOW() ELSE completed_at END
+            WHERE generation_id = $4
+            """,
+            status, api_credit_cost, error_message, generation_id,
+        )
 
 
 async def save_generated_images(
@@ -120,28 +119,104 @@ async def get_generation_images(generation_id: str) -> List[Dict[str, Any]]:
         return [dict(row) for row in rows]
 
 
-async def archive_generation(generation_id: str) -> bool:
-    """Archive (soft-delete) a generation."""
+async def get_generation_with_images(generation_id: str) -> Optional[Dict[str, Any]]:
+    """Get a generation with its images under "images", in one query."""
     pool = await get_pool()
     async with pool.acquire() as conn:
-        result = await conn.execute(
-            "UPDATE generations SET archived = 1 WHERE generation_id = $1",
+        row = await conn.fetchrow(
+            """
+            SELECT g.*,
+                   (SELECT COALESCE(jsonb_agg(to_jsonb(gi) ORDER BY gi.id), '[]'::jsonb)::text
+                    FROM generated_images gi
+                    WHERE gi.generation_id = g.generation_id) as images
+            FROM generations g
+            WHERE g.generation_id = $1
+            """,
             generation_id,
         )
-        return result != "UPDATE 0"
+        if not row:
+            return None
+        generation = dict(row)
+        generation["images"] = orjson.loads(generation["images"])
+        return generation
 
 
-async def restore_generation(generation_id: str) -> bool:
-    """Restore an archived generation."""
+async def set_archived(generation_id: str, archived: bool) -> bool:
+    """Set or clear the archived flag. Returns False if the generation is unknown."""
     pool = await get_pool()
     async with pool.acquire() as conn:
         result = await conn.execute(
-            "UPDATE generations SET archived = 0 WHERE generation_id = $1",
-            generation_id,
+            "UPDATE generations SET archived = $1 WHERE generation_id = $2",
+            1 if archived else 0, generation_id,
         )
         return result != "UPDATE 0"
 
 
+async def archive_generation(generation_id: str) -> bool:
+    """Archive (soft-delete) a generation."""
+    return await set_archived(generation_id, True)
+
+
+async def restore_generation(generation_id: str) -> bool:
+    """Restore an archived generation."""
+    return await set_archived(generation_id, False)
+
+
+@functools.lru_cache(maxsize=32)
+def _history_sql(
+    archived: bool,
+    has_status: bool,
+    has_style: bool,
+    has_exclude_style: bool,
+    has_model_id: bool,
+) -> tuple[str, str]:
+    """(page_sql, count_sql) for one get_history filter shape.
+
+    archived is inlined as a literal so the planner can match the partial
+    idx_generations_active index; the other filters are $N parameters in
+    the fixed order status, style, exclude_style, model_id, then limit and
+    offset for the page query.
+    """
+    conditions = [f"g.archived = {1 if archived else 0}"]
+    idx = 1
+    for present, condition in (
+        (has_status, "g.status = ${}"),
+        (has_style, "g.style = ${}"),
+        (has_exclude_style, "(g.style IS NULL OR g.style != ${})"),
+        (has_model_id, "g.model_id = ${}"),
+    ):
+        if present:
+            conditions.append(condition.format(idx))
+            idx += 1
+
+    where_clause = "WHERE " + " AND ".join(conditions)
+
+    # The inner query pages generations (its window count carries the
+    # filtered total); the LATERAL subquery then aggregates images for just
+    # that page, with no GROUP BY.
+    page_sql = f"""
+        SELECT page.*,
+               img.urls as image_urls,
+               img.ids as image_ids
+        FROM (
+            SELECT g.*, COUNT(*) OVER () as _total
+            FROM generations g
+            {where_clause}
+            ORDER BY g.created_at DESC
+            LIMIT ${idx} OFFSET ${idx + 1}
+        ) page
+        LEFT JOIN LATERAL (
+            SELECT ARRAY_AGG(gi.url ORDER BY gi.id) as urls,
+                   ARRAY_AGG(gi.image_id ORDER BY gi.id) as ids
+            FROM generated_images gi
+            WHERE gi.generation_id = page.generation_id AND gi.url IS NOT NULL
+        ) img ON true
+        ORDER BY page.created_at DESC
+    """
+    count_sql = f"SELECT COUNT(*) as total FROM generations g {where_clause}"
+    return page_sql, count_sql
+
+
 async def get_history(
     limit: int = 20,
     offset: int = 0,
@@ -157,66 +232,30 @@ async def get_history(
     """
     pool = await get_pool()
     async with pool.acquire() as conn:
-        # Build WHERE clause
-        conditions = ["g.archived = $1"]
-        params: list = [1 if archived else 0]
-        idx = 2
-
-        if status:
-            conditions.append(f"g.status = ${idx}")
-            params.append(status)
-            idx += 1
-        if style:
-            conditions.append(f"g.style = ${idx}")
-            params.append(style)
-            idx += 1
-        if exclude_style:
-            conditions.append(f"(g.style IS NULL OR g.style != ${idx})")
-            params.append(exclude_style)
-            idx += 1
-        if model_id:
-            conditions.append(f"g.model_id = ${idx}")
-            params.append(model_id)
-            idx += 1
-
-        where_clause = "WHERE " + " AND ".join(conditions)
-
-        # Get total count
-        count_query = f"SELECT COUNT(*) as total FROM generations g {where_clause}"
-        total = await conn.fetchval(count_query, *params)
+        page_sql, count_sql = _history_sql(
+            bool(archived), bool(status), bool(style), bool(exclude_style), bool(model_id),
+        )
+        params = [p for p in (status, style, exclude_style, model_id) if p]
 
-        # Get items with images
-        query = f"""
-            SELECT g.*,
-                   STRING_AGG(gi.url, ',') as image_urls,
-                   STRING_AGG(gi.image_id, ',') as image_ids
-            FROM generations g
-            LEFT JOIN generated_images gi ON g.generation_id = gi.generation_id
-            {where_clause}
-            GROUP BY g.id
-            ORDER BY g.created_at DESC
-            LIMIT ${idx} OFFSET ${idx + 1}
-        """
-        params.extend([limit, offset])
+        rows = await conn.fetch(page_sql, *params, limit, offset)
 
-        rows = await conn.fetch(query, *params)
+        if rows:
+            total = rows[0]["_total"]
+        else:
+            # Past the last page (or nothing matches) — count separately
+            total = await conn.fetchval(count_sql, *params)
 
         items = []
         for row in rows:
             item = dict(row)
-            # Parse concatenated images
-            if item.get("image_urls"):
-                urls = item["image_urls"].split(",")
-                ids = (item.get("image_ids") or "").split(",")
-                item["images"] = [
-                    {"url": url, "id": img_id}
-                    for url, img_id in zip(urls, ids)
-                ]
-            else:
-                item["images"] = []
-            del item["image_urls"]
-            if "image_ids" in item:
-                del item["image_ids"]
+            del item["_total"]
+            # Aggregated arrays arrive as lists (NULL when there are no images)
+            urls = item.pop("image_urls") or []
+            ids = item.pop("image_ids") or []
+            item["images"] = [
+                {"url": url, "id": img_id}
+                for url, img_id in zip(urls, ids)
+            ]
             items.append(item)
 
         return {
@@ -242,22 +281,22 @@ async def get_generation_stats() -> Dict[str, Any]:
     """Get generation statistics."""
     pool = await get_pool()
     async with pool.acquire() as conn:
-        total_generations = await conn.fetchval(
-            "SELECT COUNT(*) FROM generations"
-        )
-
-        status_rows = await conn.fetch(
-            "SELECT status, COUNT(*) as count FROM generations GROUP BY status"
-        )
+        # One scan of generations grouped by status; totals are summed from
+        # the groups. The LEFT JOIN keeps one row when there are none.
+        rows = await conn.fetch("""
+            SELECT g.status, g.count, g.credits, i.total_images
+            FROM (SELECT COUNT(*) AS total_images FROM generated_images) i
+            LEFT JOIN (
+                SELECT status, COUNT(*) AS count, SUM(api_credit_cost) AS credits
+                FROM generations
+                GROUP BY status
+            ) g ON true
+        """)
+        total_images = rows[0]["total_images"]
+        status_rows = [row for row in rows if row["status"] is not None]
         by_status = {row["status"]: row["count"] for row in status_rows}
-
-        total_credits = await conn.fetchval(
-            "SELECT COALESCE(SUM(api_credit_cost), 0) FROM generations"
-        )
-
-        total_images = await conn.fetchval(
-            "SELECT COUNT(*) FROM generated_images"
-        )
+        total_generations = sum(by_status.values())
+        total_credits = sum(row["credits"] or 0 for row in status_rows)
 
         return {
             "total_generations": total_generations,
@@ -1,7 +1,11 @@
 """Mockup templates, image mockups, and mockup packs queries."""
 
-from typing import Optional, List, Dict, Any
-from db.connection import get_pool
+import asyncio
+from typing import Optional, List, Dict, Any, Tuple
+
+import asyncpg
+
+from db.connection import get_pool, BULK_TIMEOUT
 
 
 # === Mockup Templates ===
@@ -96,33 +100,38 @@ async def update_image_mockup_status(
         return result != "UPDATE 0"
 
 
+_WORKFLOW_POSTERS_SQL = """
+    SELECT gi.*, g.prompt, g.style, g.width, g.height
+    FROM generated_images gi
+    JOIN generations g ON gi.generation_id = g.generation_id
+    WHERE gi.mockup_status = $1
+      AND g.archived = 0
+      AND (g.style IS NULL OR g.style != 'mockup')
+      {linked_filter}
+    ORDER BY gi.created_at DESC
+    LIMIT $2
+"""
+# Both variants are fixed texts, so each stays prepared in the statement cache
+_WORKFLOW_POSTERS_LINKED = _WORKFLOW_POSTERS_SQL.format(
+    linked_filter="AND gi.product_id IS NOT NULL"
+)
+_WORKFLOW_POSTERS_ANY = _WORKFLOW_POSTERS_SQL.format(linked_filter="")
+
+
 async def get_workflow_posters(
     status: str = "pending",
     limit: int = 50,
     linked_only: bool = True,
-) -> List[Dict[str, Any]]:
+) -> List[asyncpg.Record]:
     """Get posters for workflow approval (pending/needs_attention).
 
     linked_only=True filters to only images linked to a product (product_id IS NOT NULL).
     """
     pool = await get_pool()
-    async with pool.acquire() as conn:
-        linked_filter = "AND gi.product_id IS NOT NULL" if linked_only else ""
-        rows = await conn.fetch(
-            f"""
-            SELECT gi.*, g.prompt, g.style, g.width, g.height
-            FROM generated_images gi
-            JOIN generations g ON gi.generation_id = g.generation_id
-            WHERE gi.mockup_status = $1
-              AND g.archived = 0
-              AND (g.style IS NULL OR g.style != 'mockup')
-              {linked_filter}
-            ORDER BY gi.created_at DESC
-            LIMIT $2
-            """,
-            status, limit,
-        )
-        return [dict(r) for r in rows]
+    return await pool.fetch(
+        _WORKFLOW_POSTERS_LINKED if linked_only else _WORKFLOW_POSTERS_ANY,
+        status, limit,
+    )
 
 
 # === Active Mockup Templates ===
@@ -185,6 +194,60 @@ async def save_image_mockup(
         return dict(row)
 
 
+async def save_image_mockups_bulk(
+    image_id: int,
+    mockups: List[Tuple[int, str, int]],
+    pack_id: Optional[int] = None,
+    replace: bool = False,
+) -> List[int]:
+    """Upsert a set of (template_id, mockup_data, rank) mockups for one image.
+
+    The rows are streamed with COPY into a staging table and merged with a
+    single INSERT ... ON CONFLICT, so a whole pack costs one transaction
+    instead of a round trip per mockup. With replace=True the image's
+    existing mockups are deleted first, in the same transaction.
+    Returns the image_mockups ids in input order.
+    """
+    pool = await get_pool()
+    async with pool.acquire() as conn, conn.transaction():
+        if replace:
+            await conn.execute(
+                "DELETE FROM image_mockups WHERE image_id = $1", image_id
+            )
+        if not mockups:
+            return []
+        await conn.execute(
+            """
+            CREATE TEMP TABLE image_mockups_staging (
+                template_id INTEGER, mockup_data TEXT, rank INTEGER
+            ) ON COMMIT DROP
+            """
+        )
+        await conn.copy_records_to_table(
+            "image_mockups_staging",
+            records=mockups,
+            columns=("template_id", "mockup_data", "rank"),
+            timeout=BULK_TIMEOUT,
+        )
+        rows = await conn.fetch(
+            """
+            INSERT INTO image_mockups (image_id, template_id, mockup_data, rank, is_included, pack_id)
+            SELECT $1, template_id, mockup_data, rank, true, $2
+            FROM image_mockups_staging
+            ON CONFLICT (image_id, template_id) DO UPDATE SET
+              mockup_data = EXCLUDED.mockup_data,
+              rank = EXCLUDED.rank,
+              is_included = EXCLUDED.is_included,
+              pack_id = EXCLUDED.pack_id
+            RETURNING id, template_id
+            """,
+            image_id, pack_id,
+            timeout=BULK_TIMEOUT,
+        )
+    ids = {r["template_id"]: r["id"] for r in rows}
+    return [ids[template_id] for template_id, _, _ in mockups]
+
+
 async def get_image_mockups(image_id: int) -> List[Dict[str, Any]]:
     pool = await get_pool()
     async with pool.acquire() as conn:
@@ -316,14 +379,19 @@ async def delete_mockup_pack(pack_id: int) -> None:
 
 async def set_pack_templates(pack_id: int, template_ids: List[int]) -> None:
     pool = await get_pool()
-    async with pool.acquire() as conn:
+    async with pool.acquire() as conn, conn.transaction():
         await conn.execute(
             "DELETE FROM mockup_pack_templates WHERE pack_id = $1", pack_id
         )
         if template_ids:
-            await conn.executemany(
-                "INSERT INTO mockup_pack_templates (pack_id, template_id, rank) VALUES ($1, $2, $3)",
-                [(pack_id, tid, rank) for rank, tid in enumerate(template_ids, start=1)],
+            # One set-based insert; ORDINALITY gives the 1-based rank
+            await conn.execute(
+                """
+                INSERT INTO mockup_pack_templates (pack_id, template_id, rank)
+                SELECT $1, t.template_id, t.rank
+                FROM unnest($2::int[]) WITH ORDINALITY AS t(template_id, rank)
+                """,
+                pack_id, list(template_ids),
             )
 
 
@@ -340,10 +408,24 @@ async def get_pack_templates(pack_id: int) -> List[Dict[str, Any]]:
         return [dict(r) for r in rows]
 
 
+async def get_pack_with_templates(
+    pack_id: int,
+) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Get a pack and its ranked templates together.
+
+    The two reads are independent, so they run concurrently on separate
+    pool connections and the caller waits for one round trip, not two.
+    Prefer this over back-to-back get_mockup_pack/get_pack_templates.
+    """
+    pack, templates = await asyncio.gather(
+        get_mockup_pack(pack_id), get_pack_templates(pack_id)
+    )
+    return pack, templates
+
+
 async def get_image_mockup_pack_id(image_id: int) -> Optional[int]:
     pool = await get_pool()
-    async with pool.acquire() as conn:
-        return await conn.fetchval(
-            "SELECT pack_id FROM image_mockups WHERE image_id = $1 LIMIT 1",
-            image_id,
-        )
+    return await pool.fetchval(
+        "SELECT pack_id FROM image_mockups WHERE image_id = $1 LIMIT 1",
+        image_id,
+    )
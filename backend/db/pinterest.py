@@ -54,29 +54,33 @@ async def delete_pinterest_tokens() -> None:
 
 async def save_pinterest_boards(boards: list) -> int:
     """Upsert boards from Pinterest API response. Returns count saved."""
+    if not boards:
+        return 0
     pool = await get_pool()
-    count = 0
     async with pool.acquire() as conn:
-        for b in boards:
-            await conn.execute(
-                """
-                INSERT INTO pinterest_boards (board_id, name, description, pin_count, privacy, synced_at)
-                VALUES ($1, $2, $3, $4, $5, NOW())
-                ON CONFLICT(board_id) DO UPDATE SET
-                    name = EXCLUDED.name,
-                    description = EXCLUDED.description,
-                    pin_count = EXCLUDED.pin_count,
-                    privacy = EXCLUDED.privacy,
-                    synced_at = NOW()
-                """,
-                b.get("id", ""),
-                b.get("name", ""),
-                b.get("description", ""),
-                b.get("pin_count", 0) or 0,
-                b.get("privacy", "PUBLIC"),
-            )
-            count += 1
-    return count
+        await conn.executemany(
+            """
+            INSERT INTO pinterest_boards (board_id, name, description, pin_count, privacy, synced_at)
+            VALUES ($1, $2, $3, $4, $5, NOW())
+            ON CONFLICT(board_id) DO UPDATE SET
+                name = EXCLUDED.name,
+                description = EXCLUDED.description,
+                pin_count = EXCLUDED.pin_count,
+                privacy = EXCLUDED.privacy,
+                synced_at = NOW()
+            """,
+            [
+                (
+                    b.get("id", ""),
+                    b.get("name", ""),
+                    b.get("description", ""),
+                    b.get("pin_count", 0) or 0,
+                    b.get("privacy", "PUBLIC"),
+                )
+                for b in boards
+            ],
+        )
+    return len(boards)
 
 
 async def get_pinterest_boards() -> List[Dict[str, Any]]:
@@ -1,6 +1,5 @@
 """Product CRUD and linking queries."""
 
-import json
 from typing import Optional, List, Dict, Any
 from db.connection import get_pool
 
@@ -19,14 +18,13 @@ async def save_product(
 ) -> Dict[str, Any]:
     """Save a new product record."""
     pool = await get_pool()
-    metadata_json = json.dumps(etsy_metadata) if etsy_metadata else "{}"
     async with pool.acquire() as conn:
         row = await conn.fetchrow(
             """
             INSERT INTO products (printify_product_id, title, description, tags, image_url,
                                   pricing_strategy, enabled_sizes, status, etsy_metadata,
                                   source_image_id)
-            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9::jsonb, $10)
+            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
             ON CONFLICT (printify_product_id) DO UPDATE SET
                 title = EXCLUDED.title,
                 description = EXCLUDED.description,
@@ -42,7 +40,7 @@ async def save_product(
             """,
             printify_product_id, title, description,
             tags or [], image_url, pricing_strategy,
-            enabled_sizes or [], status, metadata_json,
+            enabled_sizes or [], status, etsy_metadata or {},
             source_image_id,
         )
         return dict(row)
@@ -52,24 +50,25 @@ async def link_image_to_product(image_id: int, product_id: int) -> None:
     """Set both FK directions: generated_images.product_id and products.source_image_id."""
     pool = await get_pool()
     async with pool.acquire() as conn:
+        # Both directions in one statement: one round trip, atomic
         await conn.execute(
-            "UPDATE generated_images SET product_id = $1 WHERE id = $2",
+            """
+            WITH img AS (
+                UPDATE generated_images SET product_id = $1 WHERE id = $2
+            )
+            UPDATE products SET source_image_id = $2, updated_at = NOW() WHERE id = $1
+            """,
             product_id, image_id,
         )
-        await conn.execute(
-            "UPDATE products SET source_image_id = $1, updated_at = NOW() WHERE id = $2",
-            image_id, product_id,
-        )
 
 
 async def get_image_by_url(url: str) -> Optional[Dict[str, Any]]:
     """Find a generated_image row by its URL."""
     pool = await get_pool()
-    async with pool.acquire() as conn:
-        row = await conn.fetchrow(
-            "SELECT * FROM generated_images WHERE url = $1 LIMIT 1", url
-        )
-        return dict(row) if row else None
+    row = await pool.fetchrow(
+        "SELECT * FROM generated_images WHERE url = $1 LIMIT 1", url
+    )
+    return dict(row) if row else None
 
 
 async def update_product_status(
@@ -124,12 +123,11 @@ async def set_product_dovshop_id(printify_product_id: str, dovshop_product_id: O
 async def get_product_by_printify_id(printify_product_id: str) -> Optional[Dict[str, Any]]:
     """Get a single product by Printify ID."""
     pool = await get_pool()
-    async with pool.acquire() as conn:
-        row = await conn.fetchrow(
-            "SELECT * FROM products WHERE printify_product_id = $1",
-            printify_product_id,
-        )
-        return dict(row) if row else None
+    row = await pool.fetchrow(
+        "SELECT * FROM products WHERE printify_product_id = $1",
+        printify_product_id,
+    )
+    return dict(row) if row else None
 
 
 async def get_all_products(
@@ -138,28 +136,37 @@ async def get_all_products(
     offset: int = 0,
 ) -> Dict[str, Any]:
     """Get paginated product list, optionally filtered by status."""
+    if status:
+        where, count_where, extra = "status = $3", "status = $1", (status,)
+    else:
+        where = count_where = "status != 'archived'"
+        extra = ()
     pool = await get_pool()
     async with pool.acquire() as conn:
-        if status:
-            rows = await conn.fetch(
-                """
-                SELECT * FROM products WHERE status = $1
-                ORDER BY created_at DESC LIMIT $2 OFFSET $3
-                """,
-                status, limit, offset,
-            )
-            total = await conn.fetchval(
-                "SELECT COUNT(*) FROM products WHERE status = $1", status
-            )
+        # Page and total in one pass; the total rides along on every row
+        rows = await conn.fetch(
+            f"""
+            SELECT *, COUNT(*) OVER () AS _total FROM products WHERE {where}
+            ORDER BY created_at DESC LIMIT $1 OFFSET $2
+            """,
+            limit, offset, *extra,
+        )
+        if rows:
+            total = rows[0]["_total"]
         else:
-            rows = await conn.fetch(
-                "SELECT * FROM products WHERE status != 'archived' ORDER BY created_at DESC LIMIT $1 OFFSET $2",
-                limit, offset,
+            # Page past the end: no row to carry the window count
+            total = await conn.fetchval(
+                f"SELECT COUNT(*) FROM products WHERE {count_where}", *extra
             )
-            total = await conn.fetchval("SELECT COUNT(*) FROM products WHERE status != 'archived'")
+
+        items = []
+        for r in rows:
+            item = dict(r)
+            del item["_total"]
+            items.append(item)
 
         return {
-            "items": [dict(r) for r in rows],
+            "items": items,
             "total": total,
             "limit": limit,
             "offset": offset,
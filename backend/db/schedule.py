@@ -1,8 +1,12 @@
 """Schedule queue, schedule settings, and calendar event queries."""
 
-import json
+import asyncio
 from typing import Optional, List, Dict, Any
-from db.connection import get_pool
+
+import asyncpg
+import orjson
+
+from db.connection import get_pool, DATABASE_URL
 
 
 async def add_to_schedule(
@@ -14,14 +18,13 @@ async def add_to_schedule(
 ) -> Dict[str, Any]:
     """Add a product to the publish schedule."""
     pool = await get_pool()
-    metadata_json = json.dumps(etsy_metadata) if etsy_metadata else "{}"
     async with pool.acquire() as conn:
         await conn.execute(
             """
             INSERT INTO scheduled_products (printify_product_id, title, image_url, scheduled_publish_at, etsy_metadata)
-            VALUES ($1, $2, $3, $4, $5::jsonb)
+            VALUES ($1, $2, $3, $4, $5)
             """,
-            printify_product_id, title, image_url, scheduled_publish_at, metadata_json,
+            printify_product_id, title, image_url, scheduled_publish_at, etsy_metadata or {},
         )
     return {
         "printify_product_id": printify_product_id,
@@ -33,34 +36,54 @@ async def add_to_schedule(
     }
 
 
-async def get_schedule_queue(status: Optional[str] = None) -> List[Dict[str, Any]]:
+# List views never render etsy_metadata (jsonb); fetch it per item instead
+_QUEUE_COLUMNS = """id, printify_product_id, title, image_url, status,
+    scheduled_publish_at, published_at, error_message, created_at"""
+
+
+async def get_schedule_queue(status: Optional[str] = None) -> List[asyncpg.Record]:
     """Get scheduled products, optionally filtered by status."""
     pool = await get_pool()
     async with pool.acquire() as conn:
         if status:
             rows = await conn.fetch(
-                "SELECT * FROM scheduled_products WHERE status = $1 ORDER BY scheduled_publish_at",
+                f"SELECT {_QUEUE_COLUMNS} FROM scheduled_products WHERE status = $1 ORDER BY scheduled_publish_at",
                 status,
             )
         else:
             rows = await conn.fetch(
-                "SELECT * FROM scheduled_products ORDER BY scheduled_publish_at"
+                f"SELECT {_QUEUE_COLUMNS} FROM scheduled_products ORDER BY scheduled_publish_at"
             )
-        return [dict(row) for row in rows]
+        return rows
+
+
+async def get_scheduled_product(printify_product_id: str) -> Optional[Dict[str, Any]]:
+    """Get one scheduled product with all columns, including etsy_metadata."""
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow(
+            "SELECT * FROM scheduled_products WHERE printify_product_id = $1",
+            printify_product_id,
+        )
+        return dict(row) if row else None
 
 
-async def get_pending_due() -> List[Dict[str, Any]]:
-    """Get pending products whose scheduled time has passed."""
+async def get_pending_due(limit: int = 100) -> List[asyncpg.Record]:
+    """Get pending products whose scheduled time has passed (oldest first)."""
     pool = await get_pool()
     async with pool.acquire() as conn:
+        # Walks idx_scheduled_pending in order, so published history is never
+        # touched and the scan stops after `limit` due rows
         rows = await conn.fetch(
             """
             SELECT * FROM scheduled_products
             WHERE status = 'pending' AND scheduled_publish_at::timestamptz <= NOW()
             ORDER BY scheduled_publish_at
-            """
+            LIMIT $1
+            """,
+            limit,
         )
-        return [dict(row) for row in rows]
+        return rows
 
 
 async def update_schedule_status(
@@ -71,83 +94,63 @@ async def update_schedule_status(
     """Update status of a scheduled product."""
     pool = await get_pool()
     async with pool.acquire() as conn:
-        if status == "published":
-            await conn.execute(
-                """
-                UPDATE scheduled_products
-                SET status = $1, published_at = NOW()::text, error_message = NULL
-                WHERE printify_product_id = $2
-                """,
-                status, printify_product_id,
-            )
-        else:
-            await conn.execute(
-                """
-                UPDATE scheduled_products
-                SET status = $1, error_message = $2
-                WHERE printify_product_id = $3
-                """,
-                status, error_message, printify_product_id,
-            )
+        # One statement for every status, so one cached prepare per connection
+        await conn.execute(
+            """
+            UPDATE scheduled_products
+            SET status = $1,
+                error_message = CASE WHEN $1 = 'published' THEN NULL ELSE $2 END,
+                published_at = CASE WHEN $1 = 'published' THEN NOW()::text ELSE published_at END
+            WHERE printify_product_id = $3
+            """,
+            status, error_message, printify_product_id,
+        )
 
 
 async def remove_from_schedule(printify_product_id: str) -> bool:
     """Remove a product from the schedule."""
     pool = await get_pool()
     async with pool.acquire() as conn:
-        result = await conn.execute(
-            "DELETE FROM scheduled_products WHERE printify_product_id = $1",
+        deleted = await conn.fetchval(
+            "DELETE FROM scheduled_products WHERE printify_product_id = $1 RETURNING 1",
             printify_product_id,
         )
-        return result != "DELETE 0"
+        return deleted is not None
 
 
 async def get_last_scheduled_time() -> Optional[str]:
     """Get the latest scheduled_publish_at in the queue."""
     pool = await get_pool()
     async with pool.acquire() as conn:
+        # Backward walk of idx_scheduled_publish_at: one index probe
         val = await conn.fetchval(
-            "SELECT MAX(scheduled_publish_at) FROM scheduled_products"
+            "SELECT scheduled_publish_at FROM scheduled_products "
+            "ORDER BY scheduled_publish_at DESC LIMIT 1"
         )
         return val
 
 
+# One heap pass over scheduled_products; the daily digest extends the same row.
+# published_at is written as NOW()::text, so it compares as text against
+# bounds rendered the same way instead of being re-parsed on every row.
+_SCHEDULE_STATS_COLUMNS = """
+    COUNT(*) FILTER (WHERE status = 'pending') AS pending,
+    MIN(scheduled_publish_at) FILTER (WHERE status = 'pending') AS next_publish_at,
+    COUNT(*) FILTER (
+        WHERE status = 'published'
+        AND published_at >= (NOW() - INTERVAL '7 days')::text
+    ) AS published_last_7_days,
+    COUNT(*) FILTER (WHERE status = 'failed') AS failed"""
+
+
 async def get_schedule_stats() -> Dict[str, Any]:
     """Get scheduling statistics."""
     pool = await get_pool()
     async with pool.acquire() as conn:
-        pending = await conn.fetchval(
-            "SELECT COUNT(*) FROM scheduled_products WHERE status = 'pending'"
-        )
-
         row = await conn.fetchrow(
-            """
-            SELECT scheduled_publish_at FROM scheduled_products
-            WHERE status = 'pending'
-            ORDER BY scheduled_publish_at
-            LIMIT 1
-            """
-        )
-        next_publish = row["scheduled_publish_at"] if row else None
-
-        published_7d = await conn.fetchval(
-            """
-            SELECT COUNT(*) FROM scheduled_products
-            WHERE status = 'published'
-            AND published_at::timestamp >= NOW() - INTERVAL '7 days'
-            """
-        )
-
-        failed = await conn.fetchval(
-            "SELECT COUNT(*) FROM scheduled_products WHERE status = 'failed'"
+            f"SELECT {_SCHEDULE_STATS_COLUMNS} FROM scheduled_products"
         )
-
-        return {
-            "pending": pending,
-            "next_publish_at": next_publish,
-            "published_last_7_days": published_7d,
-            "failed": failed,
-        }
+        return dict(row)
 
 
 # === Used Presets ===
@@ -201,18 +204,91 @@ _DEFAULT_PUBLISH_TIMES = ["10:00", "14:00", "18:00"]
 _DEFAULT_TIMEZONE = "US/Eastern"
 
 
+# Settings change about once a day but are read every publish cycle and UI
+# poll. Cache the decoded row in-process; save_schedule_settings NOTIFYs and
+# every worker's listener connection drops its copy. The cache is only used
+# while that listener is alive, so other processes can never serve stale rows.
+_SETTINGS_CHANNEL = "schedule_settings_changed"
+_settings_cache: Optional[Dict[str, Any]] = None
+_settings_version = 0
+_settings_lock = asyncio.Lock()
+_settings_listener: Optional[asyncpg.Connection] = None
+
+
+def _invalidate_schedule_settings(*_args) -> None:
+    global _settings_cache, _settings_version
+    _settings_cache = None
+    _settings_version += 1
+
+
+def _on_listener_closed(*_args) -> None:
+    global _settings_listener
+    _settings_listener = None
+    _invalidate_schedule_settings()
+
+
+async def start_schedule_settings_listener() -> None:
+    """Open a dedicated LISTEN connection that invalidates the settings cache."""
+    global _settings_listener
+    if _settings_listener is not None:
+        return
+    conn = await asyncpg.connect(DATABASE_URL)
+    await conn.add_listener(_SETTINGS_CHANNEL, _invalidate_schedule_settings)
+    conn.add_termination_listener(_on_listener_closed)
+    _invalidate_schedule_settings()
+    _settings_listener = conn
+
+
+async def stop_schedule_settings_listener() -> None:
+    global _settings_listener
+    conn, _settings_listener = _settings_listener, None
+    _invalidate_schedule_settings()
+    if conn is not None:
+        await conn.close()
+
+
+def _copy_settings(d: Dict[str, Any]) -> Dict[str, Any]:
+    return {**d, "publish_times": list(d["publish_times"])}
+
+
 async def get_schedule_settings() -> Dict[str, Any]:
     """Get schedule configuration. Returns defaults if no row exists."""
+    global _settings_cache
+    if _settings_cache is not None:
+        return _copy_settings(_settings_cache)
+    async with _settings_lock:
+        if _settings_cache is not None:
+            return _copy_settings(_settings_cache)
+        version = _settings_version
+        d = await _fetch_schedule_settings()
+        # Don't cache a read that raced with an invalidation
+        if _settings_listener is not None and version == _settings_version:
+            _settings_cache = d
+        return _copy_settings(d)
+
+
+_SETTINGS_COLUMNS = """id, publish_times, timezone, enabled, preferred_primary_camera,
+    default_shipping_profile_id, default_shop_section_id, updated_at"""
+
+
+def _settings_from_row(row: asyncpg.Record) -> Dict[str, Any]:
+    d = dict(row)
+    # Legacy key for older clients; built once per cache fill
+    d["publish_times_json"] = orjson.dumps(d["publish_times"]).decode()
+    return d
+
+
+async def _fetch_schedule_settings() -> Dict[str, Any]:
     pool = await get_pool()
     async with pool.acquire() as conn:
-        row = await conn.fetchrow("SELECT * FROM schedule_settings WHERE id = 1")
+        row = await conn.fetchrow(
+            f"SELECT {_SETTINGS_COLUMNS} FROM schedule_settings WHERE id = 1"
+        )
         if row:
-            d = dict(row)
-            d["publish_times"] = json.loads(d["publish_times_json"])
-            return d
+            return _settings_from_row(row)
         return {
             "id": 1,
-            "publish_times_json": json.dumps(_DEFAULT_PUBLISH_TIMES),
+            "publish_times_json": orjson.dumps(_DEFAULT_PUBLISH_TIMES).decode(),
             "publish_times": list(_DEFAULT_PUBLISH_TIMES),
             "timezone": _DEFAULT_TIMEZONE,
             "enabled": 1,
@@ -232,49 +308,57 @@ async def save_schedule_settings(
     default_shop_section_id: Optional[int] = None,
 ) -> Dict[str, Any]:
     """Upsert schedule settings (single-row, id=1)."""
-    times_json = json.dumps(publish_times)
     pool = await get_pool()
     async with pool.acquire() as conn:
-        await conn.execute(
-            """
-            INSERT INTO schedule_settings (id, publish_times_json, timezone, enabled, preferred_primary_camera,
-                                           default_shipping_profile_id, default_shop_section_id, updated_at)
-            VALUES (1, $1, $2, $3, $4, $5, $6, NOW())
-            ON CONFLICT(id) DO UPDATE SET
-                publish_times_json = EXCLUDED.publish_times_json,
-                timezone = EXCLUDED.timezone,
-                enabled = EXCLUDED.enabled,
-                preferred_primary_camera = EXCLUDED.preferred_primary_camera,
-                default_shipping_profile_id = EXCLUDED.default_shipping_profile_id,
-                default_shop_section_id = EXCLUDED.default_shop_section_id,
-                updated_at = NOW()
+        # Upsert, NOTIFY and read-back in one statement; the notification is
+        # delivered to every listener (including ours) when it commits
+        row = await conn.fetchrow(
+            f"""
+            WITH up AS (
+                INSERT INTO schedule_settings (id, publish_times, timezone, enabled, preferred_primary_camera,
+                                               default_shipping_profile_id, default_shop_section_id, updated_at)
+                VALUES (1, $1, $2, $3, $4, $5, $6, NOW())
+                ON CONFLICT(id) DO UPDATE SET
+                    publish_times = EXCLUDED.publish_times,
+                    timezone = EXCLUDED.timezone,
+                    enabled = EXCLUDED.enabled,
+                    preferred_primary_camera = EXCLUDED.preferred_primary_camera,
+                    default_shipping_profile_id = EXCLUDED.default_shipping_profile_id,
+                    default_shop_section_id = EXCLUDED.default_shop_section_id,
+                    updated_at = NOW()
+                RETURNING {_SETTINGS_COLUMNS}
+            ), notified AS (
+                SELECT pg_notify('{_SETTINGS_CHANNEL}', '')
+            )
+            SELECT up.* FROM up, notified
             """,
-            times_json, timezone, 1 if enabled else 0, preferred_primary_camera,
+            list(publish_times), timezone, 1 if enabled else 0, preferred_primary_camera,
             default_shipping_profile_id, default_shop_section_id,
         )
-    return await get_schedule_settings()
+    _invalidate_schedule_settings()
+    return _settings_from_row(row)
 
 
 async def get_daily_summary_stats() -> Dict[str, Any]:
     """Get stats for the daily Telegram digest."""
     pool = await get_pool()
     async with pool.acquire() as conn:
-        published_yesterday = await conn.fetchval(
-            """SELECT COUNT(*) FROM scheduled_products
-               WHERE status = 'published'
-               AND published_at::date = CURRENT_DATE - INTERVAL '1 day'"""
-        )
-
-        upcoming_today = await conn.fetchval(
-            """SELECT COUNT(*) FROM scheduled_products
-               WHERE status = 'pending'
-               AND scheduled_publish_at::timestamptz::date = CURRENT_DATE"""
+        row = await conn.fetchrow(
+            f"""
+            SELECT {_SCHEDULE_STATS_COLUMNS},
+                COUNT(*) FILTER (
+                    WHERE status = 'published'
+                    AND published_at >= (CURRENT_DATE - 1)::text
+                    AND published_at < CURRENT_DATE::text
+                ) AS published_yesterday,
+                COUNT(*) FILTER (
+                    WHERE status = 'pending'
+                    AND scheduled_publish_at::timestamptz::date = CURRENT_DATE
+                ) AS upcoming_today
+            FROM scheduled_products
+            """
         )
-
-    stats = await get_schedule_stats()
-    stats["published_yesterday"] = published_yesterday
-    stats["upcoming_today"] = upcoming_today
-    return stats
+        return dict(row)
 
 
 # === Calendar Event Products ===
@@ -287,11 +371,19 @@ async def track_calendar_product(
     """Link a product to a calendar event."""
     pool = await get_pool()
     async with pool.acquire() as conn:
+        # Bump the event's counter only when a new link was actually inserted
         await conn.execute(
             """
-            INSERT INTO calendar_event_products (event_id, printify_product_id, preset_id)
-            VALUES ($1, $2, $3)
-            ON CONFLICT DO NOTHING
+            WITH ins AS (
+                INSERT INTO calendar_event_products (event_id, printify_product_id, preset_id)
+                VALUES ($1, $2, $3)
+                ON CONFLICT DO NOTHING
+                RETURNING event_id
+            )
+            INSERT INTO calendar_event_counts (event_id, product_count)
+            SELECT event_id, 1 FROM ins
+            ON CONFLICT (event_id) DO UPDATE
+                SET product_count = calendar_event_counts.product_count + 1
             """,
             event_id, printify_product_id, preset_id,
         )
@@ -317,6 +409,6 @@ async def get_calendar_product_counts() -> Dict[str, int]:
     pool = await get_pool()
     async with pool.acquire() as conn:
         rows = await conn.fetch(
-            "SELECT event_id, COUNT(*) as count FROM calendar_event_products GROUP BY event_id"
+            "SELECT event_id, product_count AS count FROM calendar_event_counts WHERE product_count > 0"
         )
         return {row["event_id"]: row["count"] for row in rows}
@@ -1,6 +1,9 @@
 """SEO refresh log and autocomplete cache queries."""
 
 from typing import Optional, List, Dict, Any
+
+import asyncpg
+
 from db.connection import get_pool
 
 
@@ -34,7 +37,7 @@ async def get_seo_refresh_candidates(
     min_days_since_publish: int = 14,
     max_views: int = 5,
     limit: int = 10,
-) -> List[Dict[str, Any]]:
+) -> List[asyncpg.Record]:
     """Find published products with low views that haven't been refreshed recently.
 
     Candidates: published, have etsy_listing_id, low analytics views,
@@ -49,19 +52,16 @@ async def get_seo_refresh_candidates(
                    COALESCE(a.total_views, 0) as total_views,
                    COALESCE(a.total_favorites, 0) as total_favorites
             FROM products p
-            LEFT JOIN (
-                SELECT printify_product_id,
-                       SUM(views) as total_views,
-                       SUM(favorites) as total_favorites
-                FROM analytics
-                GROUP BY printify_product_id
-            ) a ON a.printify_product_id = p.printify_product_id
+            -- Per-product totals: a unique-index probe into the rollup
+            LEFT JOIN product_analytics_rollup a
+              ON a.printify_product_id = p.printify_product_id
             WHERE p.status = 'published'
               AND p.etsy_listing_id IS NOT NULL
               AND p.created_at < NOW() - INTERVAL '1 day' * $1
-              AND p.printify_product_id NOT IN (
-                  SELECT printify_product_id FROM seo_refresh_log
-                  WHERE created_at > NOW() - INTERVAL '7 days'
+              AND NOT EXISTS (
+                  SELECT 1 FROM seo_refresh_log srl
+                  WHERE srl.printify_product_id = p.printify_product_id
+                    AND srl.created_at > NOW() - INTERVAL '7 days'
               )
               AND COALESCE(a.total_views, 0) <= $2
             ORDER BY COALESCE(a.total_views, 0) ASC, p.created_at ASC
@@ -69,7 +69,7 @@ async def get_seo_refresh_candidates(
             """,
             min_days_since_publish, max_views, limit,
         )
-        return [dict(r) for r in rows]
+        return rows
 
 
 # === Autocomplete Cache ===
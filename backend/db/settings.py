@@ -1,6 +1,8 @@
 """App settings, Etsy tokens, and default mockup template queries."""
 
-from typing import Optional, Dict, Any
+import asyncio
+import time
+from typing import Optional, Dict, Any, Tuple
 from db.connection import get_pool
 
 
@@ -49,18 +51,45 @@ async def delete_etsy_tokens() -> None:
 
 # === App Settings ===
 
+# Settings are read on most compose/publish paths but written rarely. Keep
+# values in-process for a few seconds; set_setting drops the key here, and
+# other workers pick up a change once their entry expires.
+_SETTING_TTL = 5.0
+_setting_cache: Dict[str, Tuple[float, Optional[str]]] = {}
+_setting_version = 0
+_setting_lock = asyncio.Lock()
+
+
 async def get_setting(key: str) -> Optional[str]:
     """Get a setting value by key."""
-    pool = await get_pool()
-    async with pool.acquire() as conn:
-        row = await conn.fetchrow(
+    cached = _setting_cache.get(key)
+    if cached is not None and time.monotonic() - cached[0] < _SETTING_TTL:
+        return cached[1]
+    # Misses are rare and cheap, so one lock serves every key; callers
+    # racing on the same key share a single fetch
+    async with _setting_lock:
+        now = time.monotonic()
+        cached = _setting_cache.get(key)
+        if cached is not None and now - cached[0] < _SETTING_TTL:
+            return cached[1]
+        version = _setting_version
+        # Single statement: let the pool check a connection out and back in
+        pool = await get_pool()
+        value = await pool.fetchval(
             "SELECT value FROM app_settings WHERE key = $1", key
         )
-        return row["value"] if row else None
+        # Evict expired entries so lookups of arbitrary keys can't pile up
+        for k in [k for k, (ts, _) in _setting_cache.items() if now - ts >= _SETTING_TTL]:
+            del _setting_cache[k]
+        # Don't cache a read that raced with set_setting
+        if version == _setting_version:
+            _setting_cache[key] = (time.monotonic(), value)
+        return value
 
 
 async def set_setting(key: str, value: str) -> None:
     """Set a setting value (upsert)."""
+    global _setting_version
     pool = await get_pool()
     async with pool.acquire() as conn:
         await conn.execute(
@@ -72,6 +101,8 @@ async def set_setting(key: str, value: str) -> None:
             """,
             key, value,
         )
+    _setting_cache.pop(key, None)
+    _setting_version += 1
 
 
 async def get_default_mockup_template_id() -> Optional[int]:
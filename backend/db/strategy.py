@@ -1,6 +1,5 @@
 """AI strategy history queries."""
 
-import json
 from typing import Optional
 from db.connection import get_pool
 
@@ -10,8 +9,8 @@ async def save_ai_strategy(result: dict, product_count: int = 0) -> int:
     async with pool.acquire() as conn:
         return await conn.fetchval(
             """INSERT INTO ai_strategy_history (result, product_count)
-               VALUES ($1::jsonb, $2) RETURNING id""",
-            json.dumps(result),
+               VALUES ($1, $2) RETURNING id""",
+            result,
             product_count,
         )
 
@@ -27,7 +26,6 @@ async def get_ai_strategy_history(limit: int = 20) -> list[dict]:
         items = []
         for r in rows:
             d = dict(r)
-            d["result"] = json.loads(d["result"]) if isinstance(d["result"], str) else d["result"]
             d["created_at"] = d["created_at"].isoformat() if d["created_at"] else None
             items.append(d)
         return items
@@ -76,35 +76,34 @@ class EtsySyncService:
             if not printify_id:
                 continue
 
-            views = listing.get("views", 0) or 0
-            favorites = listing.get("num_favorers", 0) or 0
-
-            try:
-                # Preserve existing orders/revenue for today
-                existing = await db.get_product_analytics_for_date(printify_id, today)
-                await db.save_analytics(
-                    printify_product_id=printify_id,
-                    date=today,
-                    views=views,
-                    favorites=favorites,
-                    orders=existing["orders"] if existing else 0,
-                    revenue_cents=existing["revenue_cents"] if existing else 0,
-                    notes="etsy_sync",
-                )
-                synced.append({
-                    "printify_product_id": printify_id,
-                    "etsy_listing_id": listing_id,
-                    "views": views,
-                    "favorites": favorites,
-                })
-            except Exception as e:
-                logger.warning("sync views failed for %s: %s", listing_id, e)
-                synced.append({
-                    "printify_product_id": printify_id,
-                    "etsy_listing_id": listing_id,
+            synced.append({
+                "printify_product_id": printify_id,
+                "etsy_listing_id": listing_id,
+                "views": listing.get("views", 0) or 0,
+                "favorites": listing.get("num_favorers", 0) or 0,
+            })
+
+        # One batched upsert; existing orders/revenue for today are preserved
+        try:
+            await db.save_analytics_bulk(
+                [
+                    {**entry, "date": today, "notes": "etsy_sync"}
+                    for entry in synced
+                ],
+                update=("views", "favorites"),
+            )
+        except Exception as e:
+            logger.warning("sync views failed: %s", e)
+            synced = [
+                {
+                    "printify_product_id": entry["printify_product_id"],
+                    "etsy_listing_id": entry["etsy_listing_id"],
                     "error": str(e),
-                })
+                }
+                for entry in synced
+            ]
 
+        await db.refresh_analytics_rollup()
         logger.info("Etsy sync complete: %d products synced", len(synced))
         return {"synced": len(synced), "products": synced, "date": today}
 
@@ -140,22 +139,18 @@ class EtsySyncService:
                 divisor = price.get("divisor", 100) or 100
                 product_orders[printify_id]["revenue_cents"] += int(amount / divisor * 100)
 
-        # Save to analytics — preserve existing views/favorites
+        # Save to analytics in one batch — preserve existing views/favorites
         today = time.strftime("%Y-%m-%d")
-        synced = []
-        for printify_id, data in product_orders.items():
-            existing = await db.get_product_analytics_for_date(printify_id, today)
-            await db.save_analytics(
-                printify_product_id=printify_id,
-                date=today,
-                views=existing["views"] if existing else 0,
-                favorites=existing["favorites"] if existing else 0,
-                orders=data["orders"],
-                revenue_cents=data["revenue_cents"],
-                notes="etsy_order_sync",
-            )
-            synced.append({"printify_product_id": printify_id, **data})
+        synced = [
+            {"printify_product_id": printify_id, **data}
+            for printify_id, data in product_orders.items()
+        ]
+        await db.save_analytics_bulk(
+            [{**entry, "date": today, "notes": "etsy_order_sync"} for entry in synced],
+            update=("orders", "revenue_cents"),
+        )
 
+        await db.refresh_analytics_rollup()
         logger.info("Etsy order sync complete: %d products", len(synced))
         return {"synced": len(synced), "products": synced, "date": today}
 
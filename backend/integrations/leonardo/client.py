@@ -1,6 +1,10 @@
 import httpx
 import asyncio
-from typing import Optional
+import random
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import orjson
 
 
 class LeonardoAI:
@@ -28,6 +32,7 @@ class LeonardoAI:
         model_id: Optional[str] = None,
         negative_prompt: Optional[str] = None,
         ultra: bool = False,
+        client: Optional[httpx.AsyncClient] = None,
     ) -> dict:
         """
         Start a new image generation.
@@ -40,10 +45,40 @@ class LeonardoAI:
             model_id: Leonardo model ID to use
             negative_prompt: Things to avoid in the image
             ultra: Enable Ultra mode (Phoenix only, ~5MP output, costs more credits)
+            client: Pooled client from session() to reuse its connection
 
         Returns:
             dict with generation_id and initial status
         """
+        payload = self._generation_payload(
+            prompt, width, height, model_id, negative_prompt, ultra
+        )
+        if client is not None:
+            return await self._post_generation(client, payload)
+        async with httpx.AsyncClient() as client:
+            return await self._post_generation(client, payload)
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[httpx.AsyncClient]:
+        """
+        Pooled client for starting several generations back to back.
+
+        Leonardo has no multi-prompt create endpoint; passing this client to
+        create_generation lets consecutive creates share one connection, so
+        TCP/TLS setup is paid once per session instead of once per create.
+        """
+        async with httpx.AsyncClient() as client:
+            yield client
+
+    def _generation_payload(
+        self,
+        prompt: str,
+        width: int,
+        height: int,
+        model_id: Optional[str],
+        negative_prompt: Optional[str],
+        ultra: bool,
+    ) -> dict:
         payload = {
             "prompt": prompt,
             "modelId": model_id or self.DEFAULT_MODEL,
@@ -57,25 +92,26 @@ class LeonardoAI:
 
         if ultra:
             payload["ultra"] = True
+        return payload
+
+    async def _post_generation(self, client: httpx.AsyncClient, payload: dict) -> dict:
+        response = await client.post(
+            f"{self.BASE_URL}/generations",
+            headers=self.headers,
+            content=orjson.dumps(payload),
+            timeout=30.0,
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        generation_id = data.get("sdGenerationJob", {}).get("generationId")
+        if not generation_id:
+            raise ValueError("No generation ID returned from API")
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.BASE_URL}/generations",
-                headers=self.headers,
-                json=payload,
-                timeout=30.0,
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            generation_id = data.get("sdGenerationJob", {}).get("generationId")
-            if not generation_id:
-                raise ValueError("No generation ID returned from API")
-
-            return {
-                "generation_id": generation_id,
-                "status": "PENDING",
-            }
+        return {
+            "generation_id": generation_id,
+            "status": "PENDING",
+        }
 
     async def get_generation(self, generation_id: str) -> dict:
         """
@@ -166,7 +202,7 @@ class LeonardoAI:
             response = await client.post(
                 f"{self.BASE_URL}/variations/universal-upscaler",
                 headers=self.headers,
-                json=payload,
+                content=orjson.dumps(payload),
                 timeout=30.0,
             )
             response.raise_for_status()
@@ -232,27 +268,39 @@ class LeonardoAI:
         generation_id: str,
         poll_interval: float = 2.0,
         timeout: float = 60.0,
+        poll_factor: float = 1.0,
+        poll_max: Optional[float] = None,
+        jitter: float = 0.0,
     ) -> dict:
         """
         Poll for generation completion.
 
         Args:
             generation_id: The ID of the generation to wait for
-            poll_interval: Seconds between status checks
+            poll_interval: Seconds before the first re-check
             timeout: Maximum seconds to wait
+            poll_factor: Multiplier applied to the interval after each check
+                (1.0 keeps a fixed interval)
+            poll_max: Upper bound for the interval when backing off
+            jitter: Random +/- fraction applied to each sleep
 
         Returns:
             Final generation result
         """
         elapsed = 0.0
+        interval = poll_interval
         while elapsed < timeout:
             result = await self.get_generation(generation_id)
 
             if result["status"] in ("COMPLETE", "FAILED"):
                 return result
 
-            await asyncio.sleep(poll_interval)
-            elapsed += poll_interval
+            delay = min(interval, poll_max) if poll_max else interval
+            if jitter:
+                delay *= random.uniform(1 - jitter, 1 + jitter)
+            await asyncio.sleep(delay)
+            elapsed += delay
+            interval *= poll_factor
 
         return {
             "generation_id": generation_id,
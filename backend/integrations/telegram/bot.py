@@ -250,10 +250,10 @@ class TelegramBot:
             product_count = live["count"]
             source = "live from Etsy"
         else:
-            summary = await db.get_analytics_summary()
-            total_views = sum(p.get("total_views", 0) for p in summary)
-            total_favs = sum(p.get("total_favorites", 0) for p in summary)
-            product_count = len(summary)
+            totals = await db.get_analytics_grand_totals()
+            total_views = totals["total_views"]
+            total_favs = totals["total_favorites"]
+            product_count = totals["product_count"]
             source = "cached"
 
         # Orders/revenue from DB (Etsy API doesn't expose this easily)
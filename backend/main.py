@@ -76,6 +76,7 @@ async def lifespan(app: FastAPI):
     scheduler_enabled = os.getenv("SCHEDULER_ENABLED", "true").lower() in ("true", "1", "yes")
 
     await db.init_db()
+    await db.start_schedule_settings_listener()
     if scheduler_enabled:
         await publish_scheduler.start()
         await telegram_bot.start()
@@ -83,6 +84,7 @@ async def lifespan(app: FastAPI):
     if scheduler_enabled:
         await telegram_bot.stop()
         await publish_scheduler.stop()
+    await db.stop_schedule_settings_listener()
 
 
 app = FastAPI(title="Poster Generator API", version="1.0.0", lifespan=lifespan)
@@ -100,13 +100,8 @@ class PresetsManager:
     def _resolve_model_id(self, model_name: str) -> str:
         if model_name in MODEL_IDS:
             return MODEL_IDS[model_name]
-        from config import MODELS
-        for key, val in MODELS.items():
-            if key == model_name:
-                return val["id"]
-        return MODELS.get("phoenix", {}).get(
-            "id", "de7d3faf-762f-48e0-b3b7-9d0ac3a3fcf3"
-        )
+        from config import MODELS, ModelKey
+        return MODELS.get(model_name, MODELS[ModelKey.PHOENIX]).id
 
     def _save_to_disk(self, preset_id: str):
         preset = self._presets.get(preset_id)
@@ -23,12 +23,12 @@ async def get_dashboard_stats():
     """Get business-focused dashboard statistics."""
     try:
         gen_stats = await db.get_generation_stats()
-        analytics = await db.get_analytics_summary()
+        totals = await db.get_analytics_grand_totals()
 
-        total_views = sum(a.get("total_views", 0) for a in analytics)
-        total_favorites = sum(a.get("total_favorites", 0) for a in analytics)
-        total_orders = sum(a.get("total_orders", 0) for a in analytics)
-        total_revenue = sum(a.get("total_revenue_cents", 0) for a in analytics)
+        total_views = totals["total_views"]
+        total_favorites = totals["total_favorites"]
+        total_orders = totals["total_orders"]
+        total_revenue = totals["total_revenue_cents"]
 
         # Count products from local DB (no external API dependency)
         products_count = 0
@@ -289,6 +289,7 @@ async def save_analytics_entry(request: AnalyticsEntryRequest):
             revenue_cents=request.revenue_cents,
             notes=request.notes,
         )
+        await db.refresh_analytics_rollup()
         return {"ok": True}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,5 +1,6 @@
 from typing import Optional, List
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from prompt_library import library as prompt_library
 from config import MODELS, SIZES
@@ -17,6 +18,8 @@ class BatchGenerateRequest(BaseModel):
     use_variations: bool = False
     variation_index: Optional[int] = None
     delay_between: float = Field(default=3.0, ge=1.0, le=30.0)
+    concurrency: int = Field(default=4, ge=1, le=8)
+    batch_size: int = Field(default=8, ge=1, le=16)
 
 
 @router.post("/batch/generate")
@@ -47,6 +50,9 @@ async def start_batch_generation(request: BatchGenerateRequest):
         use_variations=request.use_variations,
         variation_index=request.variation_index,
         delay_between=request.delay_between,
+        concurrency=request.concurrency,
+        batch_size=request.batch_size,
+        prompt_lib=prompt_library,
     )
 
     batch_manager.start_batch(
@@ -59,7 +65,7 @@ async def start_batch_generation(request: BatchGenerateRequest):
 @router.get("/batch")
 async def list_batches():
     """List all batch jobs."""
-    return {"batches": batch_manager.list_batches()}
+    return ORJSONResponse({"batches": batch_manager.list_batches()})
 
 
 @router.get("/batch/{batch_id}")
@@ -68,7 +74,8 @@ async def get_batch_status(batch_id: str):
     job = batch_manager.get_batch(batch_id)
     if not job:
         raise HTTPException(status_code=404, detail="Batch not found")
-    return job.to_dict(include_items=True)
+    # Polled while a batch runs; serialize straight to bytes with orjson
+    return ORJSONResponse(job.to_dict(include_items=True))
 
 
 @router.post("/batch/{batch_id}/cancel")
@@ -1,7 +1,8 @@
 import json
 import asyncio
 from collections import Counter
-from datetime import date
+from datetime import date, datetime
+from typing import Optional
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 import httpx
@@ -120,10 +121,8 @@ async def get_competitor_detail(competitor_id: int):
 @router.delete("/competitors/{competitor_id}")
 async def delete_competitor(competitor_id: int):
     """Soft-delete a competitor."""
-    competitor = await db.get_competitor(competitor_id)
-    if not competitor:
+    if not await db.archive_competitor(competitor_id):
         raise HTTPException(status_code=404, detail="Competitor not found")
-    await db.archive_competitor(competitor_id)
     return {"ok": True}
 
 
@@ -143,8 +142,9 @@ async def sync_competitor(competitor_id: int):
         raise HTTPException(status_code=e.response.status_code, detail=f"Failed to fetch listings: {e}")
 
     today = date.today().isoformat()
-    synced = 0
     all_tags = []
+    listing_rows = []
+    stats_by_listing = {}
 
     for listing in listings:
         tags = listing.get("tags", [])
@@ -160,28 +160,15 @@ async def sync_competitor(competitor_id: int):
         images = listing.get("images", [])
         image_url = images[0].get("url_570xN", "") if images else ""
 
-        row = await db.upsert_competitor_listing(
-            competitor_id=competitor_id,
-            etsy_listing_id=str(listing.get("listing_id", "")),
-            title=listing.get("title", ""),
-            description=listing.get("description", ""),
-            tags=json.dumps(tags),
-            price_cents=price_cents,
-            currency=price_obj.get("currency_code", "USD"),
-            views=listing.get("views", 0) or 0,
-            favorites=listing.get("num_favorers", 0) or 0,
-            image_url=image_url,
-        )
-
-        # Save daily stats
-        await db.save_competitor_listing_stats(
-            listing_id=row["id"],
-            date=today,
-            views=listing.get("views", 0) or 0,
-            favorites=listing.get("num_favorers", 0) or 0,
-            price_cents=price_cents,
-        )
-        synced += 1
+        etsy_listing_id = str(listing.get("listing_id", ""))
+        views = listing.get("views", 0) or 0
+        favorites = listing.get("num_favorers", 0) or 0
+        listing_rows.append((
+            competitor_id, etsy_listing_id, listing.get("title", ""),
+            listing.get("description", ""), json.dumps(tags), price_cents,
+            price_obj.get("currency_code", "USD"), views, favorites, image_url,
+        ))
+        stats_by_listing[etsy_listing_id] = (views, favorites, price_cents)
 
     # Build snapshot: top 10 tags by frequency
     tag_counts = Counter(t.lower() for t in all_tags)
@@ -196,23 +183,33 @@ async def sync_competitor(competitor_id: int):
             prices.append(int(a / d * 100))
         avg_price = sum(prices) // len(prices) if prices else 0
 
-    await db.save_competitor_snapshot(
-        competitor_id=competitor_id,
+    # Listings, stats, snapshot and competitor count in one transaction
+    synced = await db.save_competitor_sync(
+        competitor_id,
+        listing_rows,
+        stats_by_listing,
         snapshot_date=today,
-        total_listings=len(listings),
         avg_price_cents=avg_price,
         top_tags=json.dumps(top_tags),
     )
 
-    # Update competitor record
-    await db.update_competitor(
-        competitor_id,
-        total_listings=len(listings),
-    )
-
     return {"synced": synced, "total_listings": len(listings), "date": today}
 
 
+_SORT_PARSERS = {
+    "views": int,
+    "favorites": int,
+    "price_cents": int,
+    "title": str,
+    "synced_at": datetime.fromisoformat,
+}
+
+
+def _parse_sort_value(sort_by: str, value: str):
+    """Convert a keyset cursor value back to the sort column's type."""
+    return _SORT_PARSERS.get(sort_by, int)(value)
+
+
 @router.get("/competitors/{competitor_id}/listings")
 async def get_competitor_listings(
     competitor_id: int,
@@ -220,22 +217,44 @@ async def get_competitor_listings(
     sort_dir: str = Query("desc"),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    after_value: Optional[str] = Query(None, description="Sort value of the last row seen"),
+    after_id: Optional[int] = Query(None, description="id of the last row seen"),
 ):
-    """Get paginated competitor listings."""
+    """Get paginated competitor listings.
+
+    Pass after_value/after_id (the response's next_after) instead of offset
+    to page by keyset.
+    """
     competitor = await db.get_competitor(competitor_id)
     if not competitor:
         raise HTTPException(status_code=404, detail="Competitor not found")
 
+    after = None
+    if after_id is not None and after_value is not None:
+        try:
+            after = (_parse_sort_value(sort_by, after_value), after_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid after_value for sort_by")
+
     listings = await db.get_competitor_listings(
-        competitor_id, sort_by=sort_by, sort_dir=sort_dir, limit=limit, offset=offset
+        competitor_id, sort_by=sort_by, sort_dir=sort_dir, limit=limit, offset=offset, after=after
     )
+    next_after = None
+    if len(listings) == limit:
+        last = listings[-1]
+        # sort_key is the NULL-free value the query sorts on
+        next_after = {"value": last["sort_key"], "id": last["id"]}
     total = await db.get_competitor_listings_count(competitor_id)
 
-    # Parse tags JSON for each listing
+    # Parse tags JSON for each listing (the only column that needs reshaping)
+    out = []
     for l in listings:
         try:
-            l["tags"] = json.loads(l.get("tags", "[]") or "[]")
+            tags = json.loads(l["tags"] or "[]")
         except (json.JSONDecodeError, TypeError):
-            l["tags"] = []
+            tags = []
+        item = {**l, "tags": tags}
+        del item["sort_key"]
+        out.append(item)
 
-    return {"listings": listings, "total": total}
+    return {"listings": out, "total": total, "next_after": next_after}
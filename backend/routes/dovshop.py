@@ -9,7 +9,7 @@ from typing import Optional, List
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 from deps import dovshop_client, etsy, printify
-from categorizer import categorize_product, get_collection_slug
+from categorizer import categorize_product, get_collection_slug, join_tags
 from dovshop_ai import enrich_product, analyze_catalog_strategy
 import database as db
 import re as _re
@@ -374,7 +374,8 @@ async def sync_all_to_dovshop(req: Request):
                     tags = []
 
             style = product.get("gen_style") or None
-            categories = categorize_product(tags, style)
+            tags_text = join_tags(tags)
+            categories = categorize_product(tags, style, tags_joined_lower=tags_text)
 
             # Get mockup images from our serve endpoint
             base_url = _get_base_url(req)
@@ -403,7 +404,7 @@ async def sync_all_to_dovshop(req: Request):
                 price_range = f"${min(prices):.2f} - ${max(prices):.2f}"
 
             title = product.get("title", "")
-            collection_slug = get_collection_slug(title, tags)
+            collection_slug = get_collection_slug(title, tags, tags_joined_lower=tags_text)
 
             posters.append({
                 "name": title,
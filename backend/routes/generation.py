@@ -3,7 +3,8 @@ from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
-from config import MODELS, SIZES, STYLE_PRESETS, DEFAULT_MODEL, DEFAULT_SIZE, DEFAULT_NEGATIVE_PROMPT
+import config
+from config import MODELS, SIZES, DEFAULT_MODEL, DEFAULT_SIZE, DEFAULT_NEGATIVE_PROMPT, generation_dims
 from deps import leonardo, LEONARDO_API_KEY, publish_scheduler
 from sizes import COMPOSITION_SUFFIX
 import database as db
@@ -73,7 +74,7 @@ async def health():
 @router.get("/styles")
 async def get_styles():
     """Return all available style presets."""
-    return STYLE_PRESETS
+    return config.STYLE_PRESETS
 
 
 @router.get("/models")
@@ -85,7 +86,7 @@ async def get_models():
 @router.get("/sizes")
 async def get_sizes():
     """Return all available poster sizes."""
-    return SIZES
+    return {key: size._asdict() for key, size in SIZES.items()}
 
 
 @router.get("/defaults")
@@ -117,16 +118,10 @@ async def start_generation(request: GenerateRequest):
 
         # Get size from key or use defaults
         if request.size_id:
-            size_info = SIZES.get(request.size_id)
-            if not size_info:
+            if request.size_id not in SIZES:
                 raise HTTPException(status_code=400, detail=f"Unknown size: {request.size_id}")
-            width = size_info["width"]
-            height = size_info["height"]
-            # Scale down proportionally to fit within Leonardo max 1536
-            if width > 1536 or height > 1536:
-                scale = 1536 / max(width, height)
-                width = int(width * scale) // 8 * 8   # must be multiple of 8
-                height = int(height * scale) // 8 * 8
+            # Scaled down proportionally to fit within Leonardo max 1536
+            width, height = generation_dims(request.size_id)
         else:
             width = request.width
             height = request.height
@@ -140,14 +135,14 @@ async def start_generation(request: GenerateRequest):
             generation_prompt = request.prompt + COMPOSITION_SUFFIX
 
         # Ultra mode only works with Phoenix
-        use_ultra = request.ultra and model_info.get("ultra", False)
+        use_ultra = request.ultra and model_info.ultra
 
         result = await leonardo.create_generation(
             prompt=generation_prompt,
             width=width,
             height=height,
             num_images=request.num_images,
-            model_id=model_info["id"],
+            model_id=model_info.id,
             negative_prompt=negative_prompt,
             ultra=use_ultra,
         )
@@ -157,8 +152,8 @@ async def start_generation(request: GenerateRequest):
             generation_id=result["generation_id"],
             prompt=request.prompt,
             negative_prompt=negative_prompt,
-            model_id=model_info["id"],
-            model_name=model_info["name"],
+            model_id=model_info.id,
+            model_name=model_info.name,
             style=request.style,
             preset=request.preset,
             width=width,
@@ -275,12 +270,9 @@ async def get_history_item(generation_id: str):
     Get a single generation from history with all details.
     """
     try:
-        generation = await db.get_generation(generation_id)
+        generation = await db.get_generation_with_images(generation_id)
         if not generation:
             raise HTTPException(status_code=404, detail="Generation not found")
-
-        images = await db.get_generation_images(generation_id)
-        generation["images"] = images
         return generation
     except HTTPException:
         raise
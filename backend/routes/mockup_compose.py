@@ -15,7 +15,8 @@ from pydantic import BaseModel
 from PIL import Image
 import httpx
 
-from config import MOCKUP_SCENES, MOCKUP_RATIOS, MODELS
+import config
+from config import MOCKUP_RATIOS, MODELS
 from deps import leonardo, LEONARDO_API_KEY
 from routes.mockup_utils import (
     MockupSceneRequest,
@@ -46,14 +47,14 @@ async def generate_mockup_scene(request: MockupSceneRequest):
     if request.custom_prompt:
         prompt = request.custom_prompt
     else:
-        scene = MOCKUP_SCENES.get(request.scene_type)
+        scene = config.MOCKUP_SCENES.get(request.scene_type)
         if not scene:
-            raise HTTPException(status_code=400, detail=f"Unknown scene type: {request.scene_type}. Available: {list(MOCKUP_SCENES.keys())}")
-        prompt = scene["prompt"]
+            raise HTTPException(status_code=400, detail=f"Unknown scene type: {request.scene_type}. Available: {list(config.MOCKUP_SCENES.keys())}")
+        prompt = scene.prompt
 
     ratio_info = MOCKUP_RATIOS.get(request.ratio, MOCKUP_RATIOS["4:5"])
-    gen_width = ratio_info["width"]
-    gen_height = ratio_info["height"]
+    gen_width = ratio_info.width
+    gen_height = ratio_info.height
 
     negative_prompt = "text, watermark, signature, words, letters, writing, multiple posters, multiple frames, collage, diptych, triptych, blurry, low quality, distorted"
 
@@ -67,7 +68,7 @@ async def generate_mockup_scene(request: MockupSceneRequest):
             width=gen_width,
             height=gen_height,
             num_images=request.num_images,
-            model_id=model_info["id"],
+            model_id=model_info.id,
             negative_prompt=negative_prompt,
         )
 
@@ -76,8 +77,8 @@ async def generate_mockup_scene(request: MockupSceneRequest):
             generation_id=result["generation_id"],
             prompt=prompt,
             negative_prompt=negative_prompt,
-            model_id=model_info["id"],
-            model_name=model_info["name"],
+            model_id=model_info.id,
+            model_name=model_info.name,
             style="mockup",
             preset=request.scene_type,
             width=gen_width,
@@ -222,11 +223,10 @@ class ComposeByPackRequest(BaseModel):
 @router.post("/mockups/compose-by-pack")
 async def compose_by_pack(request: ComposeByPackRequest):
     """Compose a poster with a specific pack's templates. Returns base64 previews."""
-    pack = await db.get_mockup_pack(request.pack_id)
+    pack, templates = await db.get_pack_with_templates(request.pack_id)
     if not pack:
         raise HTTPException(status_code=404, detail="Pack not found")
 
-    templates = await db.get_pack_templates(request.pack_id)
     if not templates:
         raise HTTPException(status_code=400, detail="Pack has no templates")
 
@@ -12,8 +12,9 @@ from typing import List, Optional
 from fastapi import APIRouter, HTTPException, File, Form, UploadFile
 from pydantic import BaseModel
 
-from config import MOCKUP_SCENES, MOCKUP_RATIOS, MOCKUP_STYLES, MODELS, COLOR_GRADE_PRESETS
-from routes.mockup_utils import SaveTemplateRequest, _compose_all_templates, _upload_multi_images_to_etsy
+import config
+from config import MOCKUP_RATIOS, MOCKUP_STYLES, MODELS, COLOR_GRADE_PRESETS
+from routes.mockup_utils import SaveTemplateRequest, _compose_all_templates, _save_composed_mockups, _upload_multi_images_to_etsy
 from routes.etsy_auth import ensure_etsy_token
 import database as db
 
@@ -28,9 +29,9 @@ router = APIRouter(tags=["mockups"])
 async def list_mockup_scenes():
     """List available mockup scene types, ratios, models, and styles."""
     return {
-        "scenes": {k: {"name": v["name"]} for k, v in MOCKUP_SCENES.items()},
-        "ratios": {k: {"name": v["name"]} for k, v in MOCKUP_RATIOS.items()},
-        "models": {k: {"name": v["name"], "description": v["description"]} for k, v in MODELS.items()},
+        "scenes": {k: {"name": v.name} for k, v in config.MOCKUP_SCENES.items()},
+        "ratios": {k: {"name": v.name} for k, v in MOCKUP_RATIOS.items()},
+        "models": {k: {"name": v.name, "description": v.description} for k, v in MODELS.items()},
         "styles": {k: {"name": v["name"], "description": v["description"]} for k, v in MOCKUP_STYLES.items()},
     }
 
@@ -235,7 +236,7 @@ async def toggle_template_active(template_id: int):
 @router.get("/mockups/color-grades")
 async def list_color_grades():
     """List available color grade presets."""
-    grades = [{"id": key, "name": preset["name"]} for key, preset in COLOR_GRADE_PRESETS.items()]
+    grades = [{"id": key, "name": preset.name} for key, preset in COLOR_GRADE_PRESETS.items()]
     return {"grades": grades}
 
 
@@ -265,10 +266,9 @@ async def list_packs():
 @router.get("/mockups/packs/{pack_id}")
 async def get_pack(pack_id: int):
     """Get a single pack with its templates."""
-    pack = await db.get_mockup_pack(pack_id)
+    pack, templates = await db.get_pack_with_templates(pack_id)
     if not pack:
         raise HTTPException(status_code=404, detail="Pack not found")
-    templates = await db.get_pack_templates(pack_id)
     for t in templates:
         if isinstance(t.get("corners"), str):
             t["corners"] = json.loads(t["corners"])
@@ -338,10 +338,9 @@ async def update_pack(pack_id: int, request: UpdatePackRequest):
 async def _background_reapply_pack(pack_id: int):
     """Background task: reapply pack to all linked products."""
     try:
-        pack = await db.get_mockup_pack(pack_id)
+        pack, templates = await db.get_pack_with_templates(pack_id)
         if not pack:
             return
-        templates = await db.get_pack_templates(pack_id)
         if not templates:
             return
         color_grade = pack.get("color_grade", "none")
@@ -381,18 +380,7 @@ async def _background_reapply_pack(pack_id: int):
                 composed = await _compose_all_templates(
                     row["poster_url"], templates, "fill", color_grade
                 )
-                await db.delete_image_mockups(row["image_id"])
-                mockup_entries = []
-                for rank_idx, (tid, png_bytes) in enumerate(composed, start=2):
-                    b64 = base64.b64encode(png_bytes).decode()
-                    saved = await db.save_image_mockup(
-                        image_id=row["image_id"],
-                        template_id=tid,
-                        mockup_data=f"data:image/png;base64,{b64}",
-                        rank=rank_idx,
-                        pack_id=pack_id,
-                    )
-                    mockup_entries.append((saved["id"], png_bytes))
+                mockup_entries = await _save_composed_mockups(row["image_id"], composed, pack_id=pack_id, replace=True)
 
                 upload_results = await _upload_multi_images_to_etsy(
                     access_token=access_token,
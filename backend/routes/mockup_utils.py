@@ -18,11 +18,13 @@ from core.mockups.compose import (  # noqa: F401
     _find_perspective_coeffs,
     apply_color_grade,
     compose_all_templates,
+    save_composed_mockups,
     upload_multi_images_to_etsy,
 )
 
 # Backward-compat aliases (old names had leading underscores)
 _compose_all_templates = compose_all_templates
+_save_composed_mockups = save_composed_mockups
 _upload_multi_images_to_etsy = upload_multi_images_to_etsy
 
 
@@ -14,9 +14,10 @@ from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from routes.mockup_utils import _compose_all_templates, _upload_multi_images_to_etsy
+from routes.mockup_utils import _compose_all_templates, _save_composed_mockups, _upload_multi_images_to_etsy
 from routes.etsy_auth import ensure_etsy_token
 import database as db
+from routes.responses import RecordJSONResponse
 
 logger = logging.getLogger(__name__)
 
@@ -101,7 +102,7 @@ async def cleanup_original_posters():
 async def get_workflow_posters(status: str = "pending", linked_only: bool = True):
     """Get posters for workflow. linked_only=true filters to product-linked images only."""
     posters = await db.get_workflow_posters(status=status, limit=100, linked_only=linked_only)
-    return {"posters": posters, "count": len(posters)}
+    return RecordJSONResponse({"posters": posters, "count": len(posters)})
 
 
 # --- Workflow: Approve ---
@@ -141,10 +142,9 @@ async def approve_poster(image_id: int, request: Optional[ApproveRequest] = None
 
     # Get templates: from pack if specified, else active templates
     if pack_id:
-        pack = await db.get_mockup_pack(pack_id)
+        pack, all_templates = await db.get_pack_with_templates(pack_id)
         if not pack:
             raise HTTPException(status_code=404, detail="Pack not found")
-        all_templates = await db.get_pack_templates(pack_id)
         if not all_templates:
             raise HTTPException(status_code=400, detail=f"Pack '{pack['name']}' has no templates")
     else:
@@ -168,19 +168,8 @@ async def approve_poster(image_id: int, request: Optional[ApproveRequest] = None
         color_grade = pack.get("color_grade", "none") if pack_id else "none"
         composed = await _compose_all_templates(image["url"], templates_to_compose, "fill", color_grade)
 
-        # Delete old image_mockups and save new ones
-        await db.delete_image_mockups(image_id)
-        mockup_entries = []  # (db_id, png_bytes)
-        for rank_idx, (tid, png_bytes) in enumerate(composed, start=2):
-            b64 = base64.b64encode(png_bytes).decode()
-            saved = await db.save_image_mockup(
-                image_id=image_id,
-                template_id=tid,
-                mockup_data=f"data:image/png;base64,{b64}",
-                rank=rank_idx,
-                pack_id=pack_id,
-            )
-            mockup_entries.append((saved["id"], png_bytes))
+        # Replace old image_mockups with the new set in one batch
+        mockup_entries = await _save_composed_mockups(image_id, composed, pack_id=pack_id, replace=True)
 
         # Also save first mockup as legacy mockup_url for backward compat
         first_mockup_url = None
@@ -516,10 +505,9 @@ async def reapply_approved_mockups(request: Optional[ReapplyRequest] = None):
     pack_id = request.pack_id if request else None
 
     if pack_id:
-        pack = await db.get_mockup_pack(pack_id)
+        pack, templates = await db.get_pack_with_templates(pack_id)
         if not pack:
             raise HTTPException(status_code=404, detail="Pack not found")
-        templates = await db.get_pack_templates(pack_id)
         if not templates:
             raise HTTPException(status_code=400, detail="Pack has no templates")
     else:
@@ -578,8 +566,7 @@ async def _background_reapply(pack_id: Optional[int], rows: list):
     done_count = 0
     try:
         if pack_id:
-            pack = await db.get_mockup_pack(pack_id)
-            templates = await db.get_pack_templates(pack_id)
+            pack, templates = await db.get_pack_with_templates(pack_id)
             color_grade = pack.get("color_grade", "none") if pack else "none"
         else:
             templates = await db.get_active_mockup_templates()
@@ -606,18 +593,7 @@ async def _background_reapply(pack_id: Optional[int], rows: list):
                     row["poster_url"], templates, "fill", color_grade
                 )
 
-                await db.delete_image_mockups(row["image_id"])
-                mockup_entries = []
-                for rank_idx, (tid, png_bytes) in enumerate(composed, start=2):
-                    b64 = base64.b64encode(png_bytes).decode()
-                    saved = await db.save_image_mockup(
-                        image_id=row["image_id"],
-                        template_id=tid,
-                        mockup_data=f"data:image/png;base64,{b64}",
-                        rank=rank_idx,
-                        pack_id=pack_id,
-                    )
-                    mockup_entries.append((saved["id"], png_bytes))
+                mockup_entries = await _save_composed_mockups(row["image_id"], composed, pack_id=pack_id, replace=True)
 
                 upload_results = await _upload_multi_images_to_etsy(
                     access_token=access_token,
@@ -774,8 +750,7 @@ async def _background_apply_missing(pack_id: int, rows: list):
     errors_list = []
     done_count = 0
     try:
-        pack = await db.get_mockup_pack(pack_id)
-        templates = await db.get_pack_templates(pack_id)
+        pack, templates = await db.get_pack_with_templates(pack_id)
         color_grade = pack.get("color_grade", "none") if pack else "none"
 
         for t in templates:
@@ -799,17 +774,7 @@ async def _background_apply_missing(pack_id: int, rows: list):
                     row["poster_url"], templates, "fill", color_grade
                 )
 
-                mockup_entries = []
-                for rank_idx, (tid, png_bytes) in enumerate(composed, start=2):
-                    b64 = base64.b64encode(png_bytes).decode()
-                    saved = await db.save_image_mockup(
-                        image_id=row["image_id"],
-                        template_id=tid,
-                        mockup_data=f"data:image/png;base64,{b64}",
-                        rank=rank_idx,
-                        pack_id=pack_id,
-                    )
-                    mockup_entries.append((saved["id"], png_bytes))
+                mockup_entries = await _save_composed_mockups(row["image_id"], composed, pack_id=pack_id)
 
                 upload_results = await _upload_multi_images_to_etsy(
                     access_token=access_token,
@@ -7,7 +7,7 @@ from presets import get_preset
 from pricing import get_all_prices
 from printify import create_variants_from_prices
 from sizes import COMPOSITION_SUFFIX
-from config import MODELS, SIZES
+from config import MODELS, SIZES, ModelSpec, SizeSpec
 from deps import (
     LEONARDO_API_KEY, leonardo, listing_gen, printify,
     notifier, publish_scheduler, upscale_service,
@@ -67,8 +67,8 @@ def _validate_model_and_size(model_id: str, size_id: str):
 async def _generate_image(
     prompt: str,
     negative_prompt: str,
-    model_info: dict,
-    size_info: dict,
+    model_info: ModelSpec,
+    size_info: SizeSpec,
     *,
     category: str,
     preset_key: str,
@@ -80,8 +80,8 @@ async def _generate_image(
     Returns (gen_id, image_url, source_image_id).
     """
     gen_prompt = prompt + COMPOSITION_SUFFIX
-    gen_width = size_info["width"]
-    gen_height = size_info["height"]
+    gen_width = size_info.width
+    gen_height = size_info.height
 
     if clamp_to_leonardo_max and (gen_width > 1536 or gen_height > 1536):
         scale = 1536 / max(gen_width, gen_height)
@@ -90,7 +90,7 @@ async def _generate_image(
 
     gen_result = await leonardo.create_generation(
         prompt=gen_prompt,
-        model_id=model_info["id"],
+        model_id=model_info.id,
         num_images=1,
         negative_prompt=negative_prompt,
         width=gen_width,
@@ -103,12 +103,12 @@ async def _generate_image(
         generation_id=gen_id,
         prompt=prompt,
         negative_prompt=negative_prompt,
-        model_id=model_info["id"],
-        model_name=model_info["name"],
+        model_id=model_info.id,
+        model_name=model_info.name,
         style=category,
         preset=preset_key,
-        width=size_info["width"],
-        height=size_info["height"],
+        width=size_info.width,
+        height=size_info.height,
         num_images=1,
     )
 
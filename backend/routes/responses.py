@@ -0,0 +1,26 @@
+"""Response classes shared by routers."""
+
+from typing import Any
+
+import asyncpg
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+def _encode_default(obj: Any) -> Any:
+    if isinstance(obj, asyncpg.Record):
+        return dict(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class RecordJSONResponse(ORJSONResponse):
+    """ORJSONResponse that also serialises asyncpg Records.
+
+    Lets db getters hand rows straight to the response instead of copying
+    every row into a dict first; the conversion happens once, inside orjson.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content, default=_encode_default, option=orjson.OPT_NON_STR_KEYS
+        )
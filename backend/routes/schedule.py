@@ -5,6 +5,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from deps import printify, publish_scheduler
 import database as db
+from routes.responses import RecordJSONResponse
 
 logger = logging.getLogger(__name__)
 
@@ -81,7 +82,7 @@ async def schedule_add(request: ScheduleAddRequest):
 @router.get("/schedule/queue")
 async def schedule_queue(status: Optional[str] = None):
     """Get the publish queue. Optional ?status=pending|published|failed."""
-    return await db.get_schedule_queue(status=status)
+    return RecordJSONResponse(await db.get_schedule_queue(status=status))
 
 
 @router.post("/schedule/publish-now/{product_id}")
@@ -180,12 +181,8 @@ async def schedule_add_batch(request: ScheduleBatchRequest):
 @router.post("/schedule/retry/{product_id}")
 async def schedule_retry(product_id: str):
     """Retry a failed publish by resetting status to pending with a new slot."""
-    queue = await db.get_schedule_queue(status="failed")
-    item = next(
-        (i for i in queue if i["printify_product_id"] == product_id),
-        None,
-    )
-    if not item:
+    item = await db.get_scheduled_product(product_id)
+    if not item or item["status"] != "failed":
         raise HTTPException(status_code=404, detail="No failed item found for this product")
 
     # Reset to pending and reschedule
@@ -1,12 +1,15 @@
 import asyncio
 import json
 import uuid
+from itertools import groupby
+from operator import itemgetter
 from typing import Optional, List
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 import httpx
 
-from config import STYLE_PRESETS, MODELS, SIZES
+import config
+from config import MODELS, SIZES, ModelKey, SizeKey, generation_dims
 from deps import listing_gen, printify, publish_scheduler, leonardo
 from pricing import get_all_prices
 from printify import create_variants_from_prices
@@ -195,9 +198,9 @@ async def generate_plan(request: GeneratePlanRequest):
 
     # Build context
     style_categories = []
-    for cat_key, cat_data in STYLE_PRESETS.items():
-        preset_names = list(cat_data["presets"].keys())
-        style_categories.append(f"- {cat_key} ({cat_data['name']}): {', '.join(preset_names)}")
+    for (cat_key, cat_name), rows in groupby(config.PRESET_INDEX, key=itemgetter(0, 1)):
+        preset_names = [row[2] for row in rows]
+        style_categories.append(f"- {cat_key} ({cat_name}): {', '.join(preset_names)}")
     styles_text = "\n".join(style_categories)
 
     existing_titles = [r["title"] for r in products][:50]
@@ -449,20 +452,18 @@ async def _generate_image(item: dict) -> tuple:
     model_id = item.get("model_id", "phoenix")
     size_id = item.get("size_id", "poster_4_5")
 
-    model_info = MODELS.get(model_id, MODELS["phoenix"])
-    size_info = SIZES.get(size_id, SIZES["poster_4_5"])
+    model_info = MODELS.get(model_id, MODELS[ModelKey.PHOENIX])
+    if size_id not in SIZES:
+        size_id = SizeKey.POSTER_4_5
+    size_info = SIZES[size_id]
 
     gen_prompt = prompt + COMPOSITION_SUFFIX
-    gen_width = size_info["width"]
-    gen_height = size_info["height"]
-    if gen_width > 1536 or gen_height > 1536:
-        scale = 1536 / max(gen_width, gen_height)
-        gen_width = int(gen_width * scale) // 8 * 8
-        gen_height = int(gen_height * scale) // 8 * 8
+    # Scaled to fit Leonardo max of 1536, precomputed per size
+    gen_width, gen_height = generation_dims(size_id)
 
     gen_result = await leonardo.create_generation(
         prompt=gen_prompt,
-        model_id=model_info["id"],
+        model_id=model_info.id,
         num_images=1,
         width=gen_width,
         height=gen_height,
@@ -473,12 +474,12 @@ async def _generate_image(item: dict) -> tuple:
         generation_id=generation_id,
         prompt=prompt,
         negative_prompt="",
-        model_id=model_info["id"],
-        model_name=model_info["name"],
+        model_id=model_info.id,
+        model_name=model_info.name,
         style=item.get("style", ""),
         preset=item.get("preset", ""),
-        width=size_info["width"],
-        height=size_info["height"],
+        width=size_info.width,
+        height=size_info.height,
         num_images=1,
     )
 
@@ -613,9 +614,7 @@ async def _finalize_plan(plan_id: int):
 async def get_coverage():
     """Get style x preset coverage metrics."""
     # Count total possible combinations from STYLE_PRESETS
-    total_combinations = 0
-    for cat_data in STYLE_PRESETS.values():
-        total_combinations += len(cat_data["presets"])
+    total_combinations = len(config.PRESET_INDEX)
 
     pool = await db.get_pool()
     async with pool.acquire() as conn:
@@ -255,11 +255,7 @@ class PublishScheduler:
     async def publish_now(self, printify_product_id: str) -> dict:
         """Immediately publish a product, bypassing the schedule."""
         # Get info before publishing (status changes after)
-        queue = await db.get_schedule_queue()
-        item_info = next(
-            (item for item in queue if item["printify_product_id"] == printify_product_id),
-            None,
-        )
+        item_info = await db.get_scheduled_product(printify_product_id)
         title = item_info["title"] if item_info else printify_product_id
         image_url = item_info.get("image_url") if item_info else None
         etsy_metadata = item_info.get("etsy_metadata", {}) if item_info else {}
@@ -584,24 +580,13 @@ class PublishScheduler:
                             if isinstance(t.get("corners"), str):
                                 t["corners"] = json_mod.loads(t["corners"])
 
-                        from core.mockups.compose import compose_all_templates as _compose_all_templates, upload_multi_images_to_etsy as _upload_multi_images_to_etsy
+                        from core.mockups.compose import compose_all_templates as _compose_all_templates, save_composed_mockups as _save_composed_mockups, upload_multi_images_to_etsy as _upload_multi_images_to_etsy
                         composed = await _compose_all_templates(poster_url, active_templates)
 
-                        mockup_entries = []
-                        for rank_idx, (tid, png_bytes) in enumerate(composed, start=2):
-                            if source_image_id:
-                                b64_str = b64_mod.b64encode(png_bytes).decode()
-                                saved = await db.save_image_mockup(
-                                    image_id=source_image_id,
-                                    template_id=tid,
-                                    mockup_data=f"data:image/png;base64,{b64_str}",
-                                    rank=rank_idx,
-                                    pack_id=compose_pack_id,
-                                )
-                                mockup_entries.append((saved["id"], png_bytes))
-                            else:
-                                # No source image in DB — upload without saving mockup record
-                                mockup_entries.append((None, png_bytes))
+                        # No source image in DB — mockups are uploaded without a saved record
+                        mockup_entries = await _save_composed_mockups(
+                            source_image_id, composed, pack_id=compose_pack_id
+                        )
 
                         upload_results = await _upload_multi_images_to_etsy(
                             access_token, shop_id, etsy_listing_id,
@@ -826,7 +811,7 @@ class PublishScheduler:
             logger.warning("[catchup] No default pack configured, skipping")
             return
         pack_id = int(default_pack_str)
-        templates = await db.get_pack_templates(pack_id)
+        pack, templates = await db.get_pack_with_templates(pack_id)
         if not templates:
             logger.warning("[catchup] Default pack %d has no templates", pack_id)
             return
@@ -834,7 +819,6 @@ class PublishScheduler:
             if isinstance(t.get("corners"), str):
                 t["corners"] = json_mod.loads(t["corners"])
 
-        pack = await db.get_mockup_pack(pack_id)
         color_grade = pack.get("color_grade", "none") if pack else "none"
 
         # Get Etsy token
@@ -844,7 +828,7 @@ class PublishScheduler:
             return
         access_token, shop_id = token_data
 
-        from core.mockups.compose import compose_all_templates as _compose_all_templates, upload_multi_images_to_etsy as _upload_multi_images_to_etsy
+        from core.mockups.compose import compose_all_templates as _compose_all_templates, save_composed_mockups as _save_composed_mockups, upload_multi_images_to_etsy as _upload_multi_images_to_etsy
 
         for row in needs_mockups:
             pid = row["printify_product_id"]
@@ -874,17 +858,9 @@ class PublishScheduler:
                     composed = await _compose_all_templates(
                         row["poster_url"], templates, "fill", color_grade
                     )
-                    mockup_entries = []
-                    for rank_idx, (tid, png_bytes) in enumerate(composed, start=2):
-                        b64_str = b64_mod.b64encode(png_bytes).decode()
-                        saved = await db.save_image_mockup(
-                            image_id=source_image_id,
-                            template_id=tid,
-                            mockup_data=f"data:image/png;base64,{b64_str}",
-                            rank=rank_idx,
-                            pack_id=pack_id,
-                        )
-                        mockup_entries.append((saved["id"], png_bytes))
+                    mockup_entries = await _save_composed_mockups(
+                        source_image_id, composed, pack_id=pack_id
+                    )
 
                 upload_results = await _upload_multi_images_to_etsy(
                     access_token, shop_id, etsy_listing_id,
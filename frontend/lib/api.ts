@@ -1391,6 +1391,8 @@ export interface BatchGenerateRequest {
   use_variations?: boolean;
   variation_index?: number;
   delay_between?: number;
+  concurrency?: number;
+  batch_size?: number;
 }
 
 export interface BatchItemStatus {
@@ -1410,6 +1412,7 @@ export interface BatchStatus {
   failed: number;
   progress_percent: number;
   current_item: string | null;
+  current_items: string[];
   model_id: string;
   size_id: string;
   created_at: number;